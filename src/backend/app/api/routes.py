@@ -7,21 +7,31 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.auth import TenantContext, get_tenant
+from app.core.config import settings
 from app.core.database import get_db
 from app.models.orm import Job, Resume, ScreeningFeedback, ScreeningResult
 from app.models.schemas import (
+    BatchScreeningStatus,
     FeedbackCreate,
     FeedbackResponse,
     JobCreate,
     JobResponse,
+    JobStatus,
+    MatchLevel,
     ResumeCreate,
     ResumeResponse,
     ScreeningResultResponse,
     ScreeningSummary,
     ScreenRequest,
+    StrengthWeakness,
 )
 from app.services.embedding_service import embed_and_store_job, embed_and_store_resume
-from app.services.screening_service import screen_candidates
+from app.services.job_service import get_job_cached
+from app.services.screening_service import (
+    collect_batch_screening,
+    screen_candidates,
+    submit_batch_screening,
+)
 
 router = APIRouter()
 
@@ -36,20 +46,21 @@ async def create_job(
     db: AsyncSession = Depends(get_db),
 ):
     """Create a new job. The job description is embedded in Qdrant for semantic matching."""
+    # Allocate the id up front so the embedding can be stored before the
+    # single INSERT, instead of INSERT + refresh + UPDATE
+    job_id = uuid.uuid4()
+    embedding_id = await embed_and_store_job(job_id, tenant.tenant_id, body.description)
+
     job = Job(
+        id=job_id,
         tenant_id=tenant.tenant_id,
         title=body.title,
         description=body.description,
         requirements=body.requirements,
+        embedding_id=embedding_id,
     )
     db.add(job)
     await db.commit()
-    await db.refresh(job)
-
-    # Generate and store embedding for the job description
-    embedding_id = await embed_and_store_job(job.id, tenant.tenant_id, body.description)
-    job.embedding_id = embedding_id
-    await db.commit()
 
     return JobResponse(
         id=job.id,
@@ -71,10 +82,11 @@ async def list_jobs(
         select(Job).where(Job.tenant_id == tenant.tenant_id).order_by(Job.created_at.desc())
     )
     jobs = result.scalars().all()
+    # Rows come from our own DB, so skip per-row validation
     return [
-        JobResponse(
+        JobResponse.model_construct(
             id=j.id, title=j.title, description=j.description,
-            requirements=j.requirements, status=j.status, created_at=j.created_at,
+            requirements=j.requirements, status=JobStatus(j.status), created_at=j.created_at,
         )
         for j in jobs
     ]
@@ -87,15 +99,12 @@ async def get_job(
     db: AsyncSession = Depends(get_db),
 ):
     """Get a specific job -- tenant-scoped."""
-    result = await db.execute(
-        select(Job).where(Job.id == job_id, Job.tenant_id == tenant.tenant_id)
-    )
-    job = result.scalar_one_or_none()
+    job = await get_job_cached(db, tenant.tenant_id, job_id)
     if job is None:
         raise HTTPException(status_code=404, detail="Job not found")
     return JobResponse(
         id=job.id, title=job.title, description=job.description,
-        requirements=job.requirements, status=job.status, created_at=job.created_at,
+        requirements=list(job.requirements), status=job.status, created_at=job.created_at,
     )
 
 
@@ -109,20 +118,19 @@ async def upload_resume(
     db: AsyncSession = Depends(get_db),
 ):
     """Upload a resume as plain text (JSON). Text is chunked and embedded in Qdrant."""
+    resume_id = uuid.uuid4()
+    embedding_id = await embed_and_store_resume(resume_id, tenant.tenant_id, body.raw_text)
+
     resume = Resume(
+        id=resume_id,
         tenant_id=tenant.tenant_id,
         candidate_name=body.candidate_name,
         email=body.email,
         raw_text=body.raw_text,
+        embedding_id=embedding_id,
     )
     db.add(resume)
     await db.commit()
-    await db.refresh(resume)
-
-    # Generate and store embedding for the resume
-    embedding_id = await embed_and_store_resume(resume.id, tenant.tenant_id, body.raw_text)
-    resume.embedding_id = embedding_id
-    await db.commit()
 
     return ResumeResponse(
         id=resume.id,
@@ -144,35 +152,38 @@ async def upload_resume_pdf(
     """Upload a PDF resume. Extracts text, chunks it, embeds in Qdrant, and scores against the selected job using GPT-4o."""
     if not file.filename or not file.filename.lower().endswith(".pdf"):
         raise HTTPException(status_code=400, detail="Only PDF files are accepted")
+    if file.size is not None and file.size > settings.max_pdf_bytes:
+        raise HTTPException(status_code=413, detail="PDF file is too large")
 
     # Verify job exists
-    job_result = await db.execute(
-        select(Job).where(Job.id == job_id, Job.tenant_id == tenant.tenant_id)
-    )
-    if job_result.scalar_one_or_none() is None:
+    if await get_job_cached(db, tenant.tenant_id, job_id) is None:
         raise HTTPException(status_code=404, detail="Job not found")
 
-    from app.services.pdf_service import extract_text_from_pdf
+    from app.services.pdf_service import extract_text_from_pdf_async
 
-    pdf_bytes = await file.read()
-    raw_text = extract_text_from_pdf(pdf_bytes)
+    # Starlette spools the upload to disk past 1 MB; read at most one byte over
+    # the cap so memory stays bounded even if the size wasn't known up front
+    pdf_bytes = await file.read(settings.max_pdf_bytes + 1)
+    if len(pdf_bytes) > settings.max_pdf_bytes:
+        raise HTTPException(status_code=413, detail="PDF file is too large")
+    raw_text = await extract_text_from_pdf_async(pdf_bytes)
 
     if len(raw_text.strip()) < 10:
         raise HTTPException(status_code=400, detail="Could not extract text from PDF")
 
+    resume_id = uuid.uuid4()
+    embedding_id = await embed_and_store_resume(resume_id, tenant.tenant_id, raw_text)
+
     resume = Resume(
+        id=resume_id,
         tenant_id=tenant.tenant_id,
         candidate_name=candidate_name,
         email=email,
         raw_text=raw_text,
+        embedding_id=embedding_id,
     )
     db.add(resume)
     await db.commit()
-    await db.refresh(resume)
-
-    embedding_id = await embed_and_store_resume(resume.id, tenant.tenant_id, raw_text)
-    resume.embedding_id = embedding_id
-    await db.commit()
 
     # Automatically screen against the specified job
     try:
@@ -199,7 +210,7 @@ async def list_resumes(
     )
     resumes = result.scalars().all()
     return [
-        ResumeResponse(
+        ResumeResponse.model_construct(
             id=r.id, candidate_name=r.candidate_name,
             email=r.email, uploaded_at=r.uploaded_at,
         )
@@ -229,6 +240,42 @@ async def screen(
     return summary
 
 
+@router.post(
+    "/screen/batch",
+    response_model=BatchScreeningStatus,
+    status_code=status.HTTP_202_ACCEPTED,
+    tags=["Screening"],
+)
+async def screen_batch(
+    body: ScreenRequest,
+    tenant: TenantContext = Depends(get_tenant),
+    db: AsyncSession = Depends(get_db),
+):
+    """Queue a screening on the OpenAI Batch API (half price, results within 24h). For nightly re-ranking and bulk imports -- poll GET /screen/batch/{batch_id} for the results."""
+    try:
+        return await submit_batch_screening(
+            db=db,
+            tenant_id=tenant.tenant_id,
+            job_id=body.job_id,
+            resume_ids=body.resume_ids,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+
+@router.get("/screen/batch/{batch_id}", response_model=BatchScreeningStatus, tags=["Screening"])
+async def get_batch_screening(
+    batch_id: str,
+    tenant: TenantContext = Depends(get_tenant),
+    db: AsyncSession = Depends(get_db),
+):
+    """Check a batch screening. When it has completed, the scores are saved and returned here once; after that use GET /results/{job_id}."""
+    try:
+        return await collect_batch_screening(db=db, tenant_id=tenant.tenant_id, batch_id=batch_id)
+    except LookupError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+
+
 @router.get("/results/{job_id}", response_model=ScreeningSummary, tags=["Screening"])
 async def get_results(
     job_id: uuid.UUID,
@@ -237,16 +284,27 @@ async def get_results(
 ):
     """Get all screening results for a job, ranked by score (highest first). Use the job_id from GET /jobs."""
     # Load job (tenant-scoped)
-    job_result = await db.execute(
-        select(Job).where(Job.id == job_id, Job.tenant_id == tenant.tenant_id)
-    )
-    job = job_result.scalar_one_or_none()
+    job = await get_job_cached(db, tenant.tenant_id, job_id)
     if job is None:
         raise HTTPException(status_code=404, detail="Job not found")
 
-    # Load results with candidate names
+    # Load results with candidate names. Select only the response columns so
+    # rows come back as plain tuples instead of hydrated ORM entities.
     results_query = await db.execute(
-        select(ScreeningResult, Resume.candidate_name)
+        select(
+            ScreeningResult.id,
+            ScreeningResult.job_id,
+            ScreeningResult.resume_id,
+            Resume.candidate_name,
+            ScreeningResult.score,
+            ScreeningResult.strengths,
+            ScreeningResult.weaknesses,
+            ScreeningResult.reasoning,
+            ScreeningResult.experience_match,
+            ScreeningResult.skills_match,
+            ScreeningResult.model_used,
+            ScreeningResult.created_at,
+        )
         .join(Resume, ScreeningResult.resume_id == Resume.id)
         .where(
             ScreeningResult.job_id == job_id,
@@ -256,25 +314,26 @@ async def get_results(
     )
     rows = results_query.all()
 
+    # Trusted DB rows: construct without validation, building nested models by hand
     results = [
-        ScreeningResultResponse(
-            id=r.id,
-            job_id=r.job_id,
-            resume_id=r.resume_id,
-            candidate_name=name,
-            score=r.score,
-            strengths=r.strengths,
-            weaknesses=r.weaknesses,
-            reasoning=r.reasoning,
-            experience_match=r.experience_match,
-            skills_match=r.skills_match,
-            model_used=r.model_used,
-            created_at=r.created_at,
+        ScreeningResultResponse.model_construct(
+            id=row.id,
+            job_id=row.job_id,
+            resume_id=row.resume_id,
+            candidate_name=row.candidate_name,
+            score=row.score,
+            strengths=[StrengthWeakness.model_construct(**s) for s in row.strengths],
+            weaknesses=[StrengthWeakness.model_construct(**w) for w in row.weaknesses],
+            reasoning=row.reasoning,
+            experience_match=MatchLevel(row.experience_match),
+            skills_match=MatchLevel(row.skills_match),
+            model_used=row.model_used,
+            created_at=row.created_at,
         )
-        for r, name in rows
+        for row in rows
     ]
 
-    return ScreeningSummary(
+    return ScreeningSummary.model_construct(
         job_id=job_id,
         job_title=job.title,
         total_candidates=len(results),
@@ -308,7 +367,10 @@ async def submit_feedback(
     if result.scalar_one_or_none() is None:
         raise HTTPException(status_code=404, detail="Screening result not found")
 
+    # Python-side id and created_at defaults are populated at flush, so
+    # with expire_on_commit=False no refresh SELECT is needed afterwards
     feedback = ScreeningFeedback(
+        id=uuid.uuid4(),
         tenant_id=tenant.tenant_id,
         result_id=result_id,
         rating=body.rating,
@@ -316,7 +378,6 @@ async def submit_feedback(
     )
     db.add(feedback)
     await db.commit()
-    await db.refresh(feedback)
     return FeedbackResponse(
         id=feedback.id,
         result_id=feedback.result_id,
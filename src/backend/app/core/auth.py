@@ -1,8 +1,10 @@
+import time
+from functools import lru_cache
 from uuid import UUID
 
+import jwt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from jose import JWTError, jwt
 from pydantic import BaseModel
 
 from app.core.config import settings
@@ -13,6 +15,23 @@ security = HTTPBearer(auto_error=False)
 DEMO_TENANT_ID = UUID("11111111-1111-1111-1111-111111111111")
 
 
+# Built once instead of per decode; missing tenant_id/sub fails verification itself
+_ALGS = [settings.jwt_algorithm]
+_JWT_OPTIONS = {"require": ["tenant_id", "sub"]}
+
+
+@lru_cache(maxsize=4096)
+def _decode_token(token: str) -> dict:
+    """Verify and decode a JWT. Cached by token so repeat callers (UI polling) skip the HMAC."""
+    return jwt.decode(token, settings.jwt_secret_bytes, algorithms=_ALGS, options=_JWT_OPTIONS)
+
+
+@lru_cache(maxsize=4096)
+def _parse_uuid(value: str) -> UUID:
+    """UUIDs are immutable, so a hot tenant's id is parsed once, not per request."""
+    return UUID(value)
+
+
 class TenantContext(BaseModel):
     tenant_id: UUID
     user_id: str
@@ -34,17 +53,17 @@ def get_tenant(
         )
 
     try:
-        payload = jwt.decode(
-            credentials.credentials,
-            settings.jwt_secret,
-            algorithms=[settings.jwt_algorithm],
-        )
+        payload = _decode_token(credentials.credentials)
+        # A cached payload was verified earlier -- expiry must still be checked now
+        exp = payload.get("exp")
+        if exp is not None and exp <= time.time():
+            raise jwt.ExpiredSignatureError("Signature has expired")
         return TenantContext(
-            tenant_id=UUID(payload["tenant_id"]),
+            tenant_id=_parse_uuid(payload["tenant_id"]),
             user_id=payload["sub"],
             role=payload.get("role", "user"),
         )
-    except (JWTError, KeyError, ValueError) as exc:
+    except (jwt.InvalidTokenError, KeyError, ValueError) as exc:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid tenant credentials",
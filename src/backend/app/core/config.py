@@ -1,3 +1,5 @@
+from functools import cached_property
+
 from pydantic_settings import BaseSettings
 
 
@@ -5,18 +7,52 @@ class Settings(BaseSettings):
     database_url: str = "postgresql+asyncpg://localhost:5432/aura"
     redis_url: str = "redis://localhost:6379/0"
     qdrant_url: str = "http://localhost:6333"
+    # gRPC sends vectors as packed float32 protobuf instead of JSON float lists.
+    qdrant_prefer_grpc: bool = True
+    qdrant_grpc_port: int = 6334
+    # Qdrant vector quantization: "scalar" (int8), "binary", or "none".
+    # Binary gives the biggest speed/RAM win but only suits >=1024-dim models.
+    qdrant_quantization: str = "scalar"
+
+    # Connection pool sized for concurrent screening bursts
+    db_pool_size: int = 40
+    db_max_overflow: int = 20
+    db_pool_recycle: int = 1800  # seconds
 
     openai_api_key: str = ""
     openai_model: str = "gpt-4o"
     embedding_model: str = "text-embedding-3-small"
 
+    # Local ONNX embeddings via FastEmbed instead of the OpenAI API.
+    # Changes the vector size, so the Qdrant collection must be recreated.
+    use_fastembed: bool = False
+    fastembed_model: str = "BAAI/bge-small-en-v1.5"
+
+    # Hybrid dense + BM25 sparse retrieval (needs fastembed and a fresh collection)
+    hybrid_search: bool = False
+    sparse_model: str = "Qdrant/bm25"
+
     jwt_secret: str = "change-me-in-production"
     jwt_algorithm: str = "HS256"
 
     # Cost controls
     default_monthly_llm_budget: int = 1000
     max_resumes_per_screen: int = 50  # vector pre-filter cap
+    llm_max_concurrency: int = 10  # parallel LLM calls per screen
+    openai_max_retries: int = 5  # client retries with backoff on 429/5xx
     result_cache_ttl: int = 86400  # 24 hours
+    embedding_cache_ttl: int = 7 * 86400  # 7 days
+
+    # Largest accepted PDF upload
+    max_pdf_bytes: int = 10 * 1024 * 1024  # 10 MB
+
+    # Threads available for CPU-bound work offloaded from the event loop
+    worker_threads: int = 16
+
+    @cached_property
+    def jwt_secret_bytes(self) -> bytes:
+        """The HMAC key as bytes, encoded once rather than on every JWT operation."""
+        return self.jwt_secret.encode()
 
     model_config = {"env_prefix": "AURA_"}
 
@@ -1,11 +1,25 @@
+from collections.abc import AsyncGenerator
+
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 
 from app.core.config import settings
 
-engine = create_async_engine(settings.database_url, pool_size=20, max_overflow=5)
-async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+engine = create_async_engine(
+    settings.database_url,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_recycle=settings.db_pool_recycle,
+    connect_args={
+        # SQLAlchemy's per-connection asyncpg prepared statement cache (default 100)
+        "prepared_statement_cache_size": 500,
+        # Short OLTP queries never benefit from PG's JIT; it only adds planning time
+        "server_settings": {"jit": "off"},
+    },
+)
+# autoflush off: writers flush explicitly, so read-only endpoints skip no-op flushes
+async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False, autoflush=False)
 
 
-async def get_db() -> AsyncSession:
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
     async with async_session() as session:
         yield session
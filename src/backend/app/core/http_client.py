@@ -0,0 +1,46 @@
+"""Shared outbound HTTP client for OpenAI chat and embedding calls.
+
+One pooled HTTP/2 client per process: concurrent screenings multiplex over
+kept-alive connections instead of each call paying DNS + TLS setup.
+"""
+
+import httpx
+from openai import AsyncOpenAI
+
+from app.core.config import settings
+
+_http_client: httpx.AsyncClient | None = None
+_openai_client: AsyncOpenAI | None = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+            # Fail fast on connect; completions with 1500 output tokens can take a while
+            timeout=httpx.Timeout(60.0, connect=5.0),
+        )
+    return _http_client
+
+
+def get_openai_client() -> AsyncOpenAI:
+    """Get or create the raw OpenAI SDK client, on the shared HTTP client."""
+    global _openai_client
+    if _openai_client is None:
+        _openai_client = AsyncOpenAI(
+            api_key=settings.openai_api_key,
+            max_retries=settings.openai_max_retries,
+            http_client=get_http_client(),
+        )
+    return _openai_client
+
+
+async def close_http_client() -> None:
+    """Close the shared client (called on application shutdown)."""
+    global _http_client, _openai_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+        _openai_client = None
@@ -1,11 +1,34 @@
 """FastAPI application entry point."""
 
+from contextlib import asynccontextmanager
+
+import anyio.to_thread
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from app.api.routes import router
+from app.core.config import settings
+from app.core.http_client import close_http_client
+from app.services.embedding_service import close_embedding_batcher
+from app.services.llm_service import reset_llm
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Size the thread pool used for PDF extraction and other blocking calls
+    anyio.to_thread.current_default_thread_limiter().total_tokens = settings.worker_threads
+    yield
+    await close_embedding_batcher()
+    # The LLM wrappers hold the shared HTTP client; rebuild them on next use
+    reset_llm()
+    await close_http_client()
+
 
 app = FastAPI(
+    lifespan=lifespan,
+    # orjson encodes the nested screening results (UUIDs, datetimes) much faster than stdlib json
+    default_response_class=ORJSONResponse,
     title="Aura - AI Resume Screening",
     description="""
 AI-powered resume screening tool for HR teams. Upload a PDF resume, pick a job,
@@ -10,6 +10,7 @@ from sqlalchemy import (
     String,
     Text,
     UniqueConstraint,
+    text,
 )
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
@@ -41,7 +42,8 @@ class Job(Base):
     status: Mapped[str] = mapped_column(String(20), default="active")
     created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
 
-    __table_args__ = (Index("idx_jobs_tenant", "tenant_id"),)
+    # Matches list_jobs: filter by tenant, newest first
+    __table_args__ = (Index("idx_jobs_tenant_created", "tenant_id", text("created_at DESC")),)
 
 
 class Resume(Base):
@@ -56,7 +58,8 @@ class Resume(Base):
     embedding_id: Mapped[str | None] = mapped_column(String(200), nullable=True)
     uploaded_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
 
-    __table_args__ = (Index("idx_resumes_tenant", "tenant_id"),)
+    # Matches list_resumes: filter by tenant, newest first
+    __table_args__ = (Index("idx_resumes_tenant_uploaded", "tenant_id", text("uploaded_at DESC")),)
 
 
 class ScreeningResult(Base):
@@ -80,7 +83,9 @@ class ScreeningResult(Base):
     __table_args__ = (
         UniqueConstraint("job_id", "resume_id", name="uq_job_resume"),
         CheckConstraint("score >= 0 AND score <= 100", name="ck_score_range"),
-        Index("idx_results_tenant_job", "tenant_id", "job_id"),
+        # get_results filters by (tenant, job) and orders by score; the index
+        # returns rows pre-sorted so Postgres skips the in-memory sort
+        Index("idx_results_tenant_job_score", "tenant_id", "job_id", text("score DESC")),
     )
 
 
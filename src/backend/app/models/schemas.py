@@ -73,6 +73,33 @@ class ScreeningScore(BaseModel):
     experience_match: MatchLevel
     skills_match: MatchLevel
 
+    @classmethod
+    def from_trusted(cls, data: dict) -> "ScreeningScore":
+        """Build a score from data we wrote ourselves (cache, DB), skipping validation.
+
+        Range checks are bypassed; never use this for LLM output.
+        """
+        return cls.model_construct(
+            score=data["score"],
+            strengths=[StrengthWeakness.model_construct(**s) for s in data["strengths"]],
+            weaknesses=[StrengthWeakness.model_construct(**w) for w in data["weaknesses"]],
+            reasoning=data["reasoning"],
+            experience_match=MatchLevel(data["experience_match"]),
+            skills_match=MatchLevel(data["skills_match"]),
+        )
+
+
+# The compiled core validator, looked up once instead of on every parse
+_SCORE_VALIDATOR = ScreeningScore.__pydantic_validator__
+
+
+def parse_llm_score(raw: bytes | str) -> ScreeningScore:
+    """Parse and validate a raw LLM JSON reply in a single pass.
+
+    Raises pydantic.ValidationError on malformed JSON or out-of-spec values.
+    """
+    return _SCORE_VALIDATOR.validate_json(raw)
+
 
 class ScreeningResultResponse(BaseModel):
     model_config = {"protected_namespaces": ()}
@@ -98,6 +125,15 @@ class ScreeningSummary(BaseModel):
     results: list[ScreeningResultResponse]
 
 
+class BatchScreeningStatus(BaseModel):
+    """A screening queued on the OpenAI Batch API."""
+    batch_id: str
+    job_id: UUID
+    status: str = Field(description="Batch API status, e.g. submitted, in_progress, completed, failed, expired")
+    total_candidates: int
+    summary: ScreeningSummary | None = Field(default=None, description="Ranked results, once the batch has completed")
+
+
 # --- Feedback schemas ---
 
 class FeedbackCreate(BaseModel):
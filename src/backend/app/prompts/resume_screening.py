@@ -3,6 +3,8 @@
 Versioned so we can track which prompt produced which scores.
 """
 
+import string
+
 PROMPT_VERSION = "v1.0"
 
 SYSTEM_PROMPT = """\
@@ -45,6 +47,31 @@ as JSON with this exact structure:
 }}"""
 
 
+def _split_template(template: str, fields: tuple[str, ...]) -> list[str]:
+    """Split a format template into the literal segments around its fields.
+
+    Segments have {{ }} escapes already resolved, so joining them with the
+    field values gives the same result as template.format(...).
+    """
+    segments = [""]
+    found = []
+    for literal, field, _, _ in string.Formatter().parse(template):
+        segments[-1] += literal
+        if field is not None:
+            found.append(field)
+            segments.append("")
+    if tuple(found) != fields:
+        raise ValueError(f"Template fields {found} do not match {list(fields)}")
+    return segments
+
+
+# Parsed once at import -- .format() would re-parse the template (including
+# the escaped JSON braces) for every candidate in a screen.
+_USER_PROMPT_SEGMENTS = _split_template(
+    USER_PROMPT_TEMPLATE, ("job_title", "job_description", "resume_text")
+)
+
+
 def build_screening_prompt(
     job_title: str,
     job_description: str,
@@ -54,9 +81,11 @@ def build_screening_prompt(
 
     Returns (system_prompt, user_prompt).
     """
-    user_prompt = USER_PROMPT_TEMPLATE.format(
-        job_title=job_title,
-        job_description=job_description,
-        resume_text=resume_text,
-    )
+    head, after_title, after_description, tail = _USER_PROMPT_SEGMENTS
+    user_prompt = "".join((
+        head, job_title,
+        after_title, job_description,
+        after_description, resume_text,
+        tail,
+    ))
     return SYSTEM_PROMPT, user_prompt
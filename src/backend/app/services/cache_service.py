@@ -1,31 +1,55 @@
-"""Redis caching for screening results.
+"""Redis caching for screening results and embeddings.
 
 Avoids re-scoring the same resume against the same JD.
 Cache key includes a hash of the JD content so scores invalidate
 when the job description is edited.
+
+Scores are stored as msgpack rather than JSON: smaller values on the wire
+and faster to decode on every cache hit.
+
+Embeddings are cached by model + text hash (a pure function of the input,
+so entries are shared across tenants) as packed float32 arrays.
 """
 
 import hashlib
-import json
+import logging
+from array import array
 from uuid import UUID
 
+import msgpack
 import redis.asyncio as redis
 
 from app.core.config import settings
 from app.models.schemas import ScreeningScore
 
+logger = logging.getLogger(__name__)
+
 _redis_client: redis.Redis | None = None
 
 
 def get_redis() -> redis.Redis:
     global _redis_client
     if _redis_client is None:
-        _redis_client = redis.from_url(settings.redis_url, decode_responses=True)
+        # Values are binary msgpack, so responses must stay as bytes
+        _redis_client = redis.from_url(settings.redis_url, decode_responses=False)
     return _redis_client
 
 
+# Packer is reusable and the event loop is single-threaded, so one per process
+_PACKER = msgpack.Packer(use_bin_type=True)
+
+
+def _encode_score(score: ScreeningScore) -> bytes:
+    return _PACKER.pack(score.model_dump(mode="json"))
+
+
+def _decode_score(data: bytes) -> ScreeningScore:
+    """Inverse of _encode_score; raises ValueError/KeyError/TypeError on foreign data."""
+    return ScreeningScore.from_trusted(msgpack.unpackb(data, raw=False))
+
+
 def _cache_key(tenant_id: UUID, job_id: UUID, resume_id: UUID, jd_hash: str) -> str:
-    return f"tenant:{tenant_id}:screen:{job_id}:{resume_id}:{jd_hash}"
+    return ":".join(("tenant", str(tenant_id), "screen", str(job_id), str(resume_id), jd_hash))
 
 
 def hash_jd(description: str) -> str:
@@ -45,7 +69,12 @@ async def get_cached_score(
     data = await r.get(key)
     if data is None:
         return None
-    return ScreeningScore.model_validate_json(data)
+    try:
+        return _decode_score(data)
+    except (ValueError, KeyError, TypeError):
+        # Entry written in an older format (e.g. JSON) -- treat as a miss
+        logger.info("Discarding unreadable cache entry %s", key)
+        return None
 
 
 async def set_cached_score(
@@ -58,4 +87,38 @@ async def set_cached_score(
     """Cache a screening score with TTL."""
     r = get_redis()
     key = _cache_key(tenant_id, job_id, resume_id, jd_hash)
-    await r.set(key, score.model_dump_json(), ex=settings.result_cache_ttl)
+    await r.set(key, _encode_score(score), ex=settings.result_cache_ttl)
+
+
+def _embedding_key(model: str, text: str) -> str:
+    return f"emb:{model}:{hashlib.sha256(text.encode()).hexdigest()}"
+
+
+async def get_cached_embeddings(model: str, texts: list[str]) -> list[list[float] | None]:
+    """Look up embeddings for `texts` in one MGET; None marks a miss."""
+    if not texts:
+        return []
+    try:
+        blobs = await get_redis().mget([_embedding_key(model, text) for text in texts])
+    except redis.RedisError as exc:
+        # The cache is an optimisation -- never fail an embedding because of it
+        logger.warning("Embedding cache lookup failed: %s", exc)
+        return [None] * len(texts)
+    return [array("f", blob).tolist() if blob is not None else None for blob in blobs]
+
+
+async def set_cached_embeddings(
+    model: str,
+    texts: list[str],
+    vectors: list[list[float]],
+) -> None:
+    """Store embeddings with TTL, pipelined into a single round trip."""
+    if not texts:
+        return
+    pipe = get_redis().pipeline(transaction=False)
+    for text, vector in zip(texts, vectors):
+        pipe.set(_embedding_key(model, text), array("f", vector).tobytes(), ex=settings.embedding_cache_ttl)
+    try:
+        await pipe.execute()
+    except redis.RedisError as exc:
+        logger.warning("Embedding cache write failed: %s", exc)
@@ -0,0 +1,125 @@
+"""Micro-batching for embedding requests.
+
+Concurrent callers submit texts; a background task collects everything that
+arrives within a short window and sends it as one embeddings API call, so a
+burst of uploads shares a single HTTP round trip instead of paying one each.
+"""
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+MAX_BATCH_SIZE = 32
+MAX_WAIT_SECONDS = 0.015
+
+EmbedFn = Callable[[list[str]], Awaitable[list[list[float]]]]
+
+
+def _fail(batch: list[tuple[str, asyncio.Future]], exc: BaseException) -> None:
+    """Fail every still-pending caller in `batch` with `exc`."""
+    for _, future in batch:
+        if not future.done():
+            future.set_exception(exc)
+
+
+class EmbeddingBatcher:
+    """Coalesce concurrent embedding requests into batched calls to `embed_fn`."""
+
+    def __init__(
+        self,
+        embed_fn: EmbedFn,
+        max_batch_size: int = MAX_BATCH_SIZE,
+        max_wait: float = MAX_WAIT_SECONDS,
+    ) -> None:
+        self._embed_fn = embed_fn
+        self._max_batch_size = max_batch_size
+        self._max_wait = max_wait
+        self._queue: asyncio.Queue[tuple[str, asyncio.Future]] | None = None
+        self._worker: asyncio.Task | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._flushes: set[asyncio.Task] = set()
+
+    def _ensure_worker(self) -> asyncio.Queue:
+        """Start the drain task on the running loop (restarting it if the loop changed)."""
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done() or self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run(self._queue))
+        return self._queue
+
+    async def submit(self, text: str) -> list[float]:
+        """Embed a single text, sharing the API call with concurrent submitters."""
+        return (await self.submit_many([text]))[0]
+
+    async def submit_many(self, texts: list[str]) -> list[list[float]]:
+        """Embed several texts; results are returned in input order."""
+        queue = self._ensure_worker()
+        loop = asyncio.get_running_loop()
+        futures = []
+        for text in texts:
+            future = loop.create_future()
+            queue.put_nowait((text, future))
+            futures.append(future)
+
+        results = await asyncio.gather(*futures, return_exceptions=True)
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        return results
+
+    async def _run(self, queue: asyncio.Queue) -> None:
+        while True:
+            batch = [await queue.get()]
+            try:
+                # Give concurrent callers a short window to join this batch
+                if queue.qsize() < self._max_batch_size - 1:
+                    await asyncio.sleep(self._max_wait)
+            except asyncio.CancelledError:
+                # Closed mid-window: the batch in hand is off the queue, so fail it here
+                _fail(batch, RuntimeError("Embedding batcher is closed"))
+                raise
+            while len(batch) < self._max_batch_size and not queue.empty():
+                batch.append(queue.get_nowait())
+
+            # Flush in its own task so a slow API call doesn't hold up the next batch
+            task = asyncio.create_task(self._flush(batch))
+            self._flushes.add(task)
+            task.add_done_callback(self._flushes.discard)
+
+    async def _flush(self, batch: list[tuple[str, asyncio.Future]]) -> None:
+        texts = [text for text, _ in batch]
+        try:
+            vectors = await self._embed_fn(texts)
+        except Exception as exc:
+            logger.error("Embedding batch of %d texts failed: %s", len(texts), exc)
+            _fail(batch, exc)
+            return
+
+        if len(vectors) != len(batch):
+            # zip would silently leave the extra callers waiting forever
+            exc = RuntimeError(f"Embedding batch returned {len(vectors)} vectors for {len(batch)} texts")
+            logger.error("%s", exc)
+            _fail(batch, exc)
+            return
+
+        for (_, future), vector in zip(batch, vectors):
+            if not future.done():
+                future.set_result(vector)
+
+    async def close(self) -> None:
+        """Stop the drain task, fail queued requests and wait for in-flight batches."""
+        if self._worker is not None:
+            self._worker.cancel()
+            await asyncio.gather(self._worker, return_exceptions=True)
+            self._worker = None
+        if self._queue is not None:
+            queued = []
+            while not self._queue.empty():
+                queued.append(self._queue.get_nowait())
+            _fail(queued, RuntimeError("Embedding batcher is closed"))
+            self._queue = None
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
@@ -2,62 +2,167 @@
 
 Flow:
   1. Text chunking (RecursiveCharacterTextSplitter, 500 chars, 100 overlap)
-  2. Embed each chunk with OpenAI text-embedding-3-small
-  3. Store chunk vectors in Qdrant with metadata
+  2. Embed each chunk with OpenAI text-embedding-3-small, or locally with
+     FastEmbed when AURA_USE_FASTEMBED is set (a resume's chunks go out as
+     one request; concurrent single-text embeds such as job descriptions
+     are coalesced into batched calls by EmbeddingBatcher)
+  3. Store chunk vectors in Qdrant with metadata (plus BM25 sparse vectors
+     when AURA_HYBRID_SEARCH is set)
   4. At query time, retrieve most relevant chunks per resume
 """
 
+import asyncio
 import logging
 from uuid import UUID
 
-from langchain_openai import OpenAIEmbeddings
+import anyio.to_thread
 from langchain_text_splitters import RecursiveCharacterTextSplitter
+from qdrant_client.models import SparseVector
 
 from app.core.config import settings
-from app.services import vector_service
+from app.core.http_client import get_openai_client
+from app.services import cache_service, vector_service
+from app.services.embedding_batcher import EmbeddingBatcher
 
 logger = logging.getLogger(__name__)
 
-EMBEDDING_DIM = 1536  # text-embedding-3-small dimension
+EMBEDDING_DIM = vector_service.VECTOR_DIM
 CHUNK_SIZE = 500
 CHUNK_OVERLAP = 100
+# Texts per embeddings request (the API accepts up to 2048), and how many
+# requests may be in flight per call
+EMBED_BATCH_SIZE = 256
+EMBED_MAX_CONCURRENCY = 8
 
-_embeddings_model: OpenAIEmbeddings | None = None
+_fastembed_model = None
+_sparse_model = None
+_embedding_batcher: EmbeddingBatcher | None = None
 
 
-def get_embeddings_model() -> OpenAIEmbeddings:
-    """Get or create the OpenAI embeddings model."""
-    global _embeddings_model
-    if _embeddings_model is None:
-        _embeddings_model = OpenAIEmbeddings(
-            model=settings.embedding_model,
-            api_key=settings.openai_api_key,
-        )
-    return _embeddings_model
+def get_fastembed_model():
+    """Get or create the local FastEmbed ONNX model (loaded once per process)."""
+    global _fastembed_model
+    if _fastembed_model is None:
+        from fastembed import TextEmbedding
+
+        _fastembed_model = TextEmbedding(settings.fastembed_model)
+    return _fastembed_model
+
+
+def _fastembed_texts(texts: list[str]) -> list[list[float]]:
+    return [vector.tolist() for vector in get_fastembed_model().embed(texts)]
+
+
+def get_sparse_model():
+    """Get or create the FastEmbed BM25 model used for hybrid search."""
+    global _sparse_model
+    if _sparse_model is None:
+        from fastembed import SparseTextEmbedding
+
+        _sparse_model = SparseTextEmbedding(settings.sparse_model)
+    return _sparse_model
+
+
+def _to_sparse_vector(embedding) -> SparseVector:
+    return SparseVector(indices=embedding.indices.tolist(), values=embedding.values.tolist())
+
+
+def _sparse_texts(texts: list[str]) -> list[SparseVector]:
+    return [_to_sparse_vector(e) for e in get_sparse_model().embed(texts)]
+
+
+def _sparse_query(text: str) -> SparseVector:
+    return _to_sparse_vector(next(iter(get_sparse_model().query_embed(text))))
+
+
+def get_embedding_batcher() -> EmbeddingBatcher:
+    """Get or create the shared batcher that coalesces embedding requests."""
+    global _embedding_batcher
+    if _embedding_batcher is None:
+        _embedding_batcher = EmbeddingBatcher(embed_texts)
+    return _embedding_batcher
+
+
+async def close_embedding_batcher() -> None:
+    """Stop the shared batcher's background task (called on application shutdown)."""
+    global _embedding_batcher
+    if _embedding_batcher is not None:
+        await _embedding_batcher.close()
+        _embedding_batcher = None
+
+
+# Built once: the splitter is stateless, so every call can share it
+_SPLITTER = RecursiveCharacterTextSplitter(
+    chunk_size=CHUNK_SIZE,
+    chunk_overlap=CHUNK_OVERLAP,
+    length_function=len,
+    separators=["\n\n", "\n", " ", ""],
+)
 
 
 def chunk_text(text: str) -> list[str]:
     """Split text into overlapping chunks for embedding."""
-    splitter = RecursiveCharacterTextSplitter(
-        chunk_size=CHUNK_SIZE,
-        chunk_overlap=CHUNK_OVERLAP,
-        length_function=len,
-        separators=["\n\n", "\n", " ", ""],
+    if len(text) <= CHUNK_SIZE:
+        # Fits in one chunk -- same result as the splitter, without running it
+        return [text.strip() or text]
+    return _SPLITTER.split_text(text) or [text]
+
+
+async def _openai_embed(texts: list[str]) -> list[list[float]]:
+    """One /v1/embeddings request for the whole list; results come back in input order."""
+    response = await get_openai_client().embeddings.create(
+        model=settings.embedding_model,
+        input=texts,
     )
-    chunks = splitter.split_text(text)
-    return chunks if chunks else [text]
+    return [item.embedding for item in response.data]
+
+
+async def _openai_embed_batched(texts: list[str]) -> list[list[float]]:
+    """Embed via the API, splitting large inputs into concurrent batches."""
+    if len(texts) <= EMBED_BATCH_SIZE:
+        return await _openai_embed(texts)
+
+    # Larger inputs are split into batches that are sent concurrently
+    semaphore = asyncio.Semaphore(EMBED_MAX_CONCURRENCY)
+
+    async def embed_batch(batch: list[str]) -> list[list[float]]:
+        async with semaphore:
+            return await _openai_embed(batch)
+
+    batches = [texts[i:i + EMBED_BATCH_SIZE] for i in range(0, len(texts), EMBED_BATCH_SIZE)]
+    results = await asyncio.gather(*(embed_batch(batch) for batch in batches))
+    return [vector for batch_vectors in results for vector in batch_vectors]
 
 
 async def embed_texts(texts: list[str]) -> list[list[float]]:
-    """Embed a list of texts using OpenAI embeddings."""
-    model = get_embeddings_model()
-    return await model.aembed_documents(texts)
+    """Embed a list of texts using OpenAI embeddings (or FastEmbed if enabled).
+
+    OpenAI embeddings are cached in Redis by content hash, so only texts not
+    seen before (e.g. new chunks, an edited JD) reach the API.
+    """
+    if settings.use_fastembed:
+        # ONNX inference is CPU-bound; keep it off the event loop
+        return await anyio.to_thread.run_sync(_fastembed_texts, texts)
+
+    model = settings.embedding_model
+    vectors = await cache_service.get_cached_embeddings(model, texts)
+    # Embed each distinct missing text once
+    misses = list(dict.fromkeys(text for text, vector in zip(texts, vectors) if vector is None))
+    if misses:
+        fresh = dict(zip(misses, await _openai_embed_batched(misses)))
+        await cache_service.set_cached_embeddings(model, misses, list(fresh.values()))
+        vectors = [fresh[text] if vector is None else vector for text, vector in zip(texts, vectors)]
+    return vectors
+
 
+async def embed_sparse(texts: list[str]) -> list[SparseVector]:
+    """Compute BM25 sparse vectors for documents (hybrid search)."""
+    return await anyio.to_thread.run_sync(_sparse_texts, texts)
 
-async def embed_query(text: str) -> list[float]:
-    """Embed a single query text (for search)."""
-    model = get_embeddings_model()
-    return await model.aembed_query(text)
+
+async def embed_sparse_query(text: str) -> SparseVector:
+    """Compute the BM25 sparse vector for a search query (hybrid search)."""
+    return await anyio.to_thread.run_sync(_sparse_query, text)
 
 
 async def embed_and_store_resume(
@@ -70,7 +175,16 @@ async def embed_and_store_resume(
     Returns the resume_id as the embedding reference.
     """
     chunks = chunk_text(text)
-    embeddings = await embed_texts(chunks)
+    # The whole chunk list is already a batch; the batcher would cap it at
+    # MAX_BATCH_SIZE texts per request
+    sparse_embeddings = None
+    if settings.hybrid_search:
+        embeddings, sparse_embeddings = await asyncio.gather(
+            embed_texts(chunks),
+            embed_sparse(chunks),
+        )
+    else:
+        embeddings = await embed_texts(chunks)
 
     await vector_service.ensure_collection()
     await vector_service.upsert_resume_chunks(
@@ -78,6 +192,7 @@ async def embed_and_store_resume(
         tenant_id=tenant_id,
         chunks=chunks,
         embeddings=embeddings,
+        sparse_embeddings=sparse_embeddings,
     )
 
     logger.info(
@@ -93,22 +208,15 @@ async def embed_and_store_job(
     text: str,
 ) -> str:
     """Embed job description and store in Qdrant (single vector, no chunking)."""
-    embedding = await embed_query(text)
+    embedding = await get_embedding_batcher().submit(text)
+    sparse_embedding = (await embed_sparse([text]))[0] if settings.hybrid_search else None
 
     await vector_service.ensure_collection()
-
-    from qdrant_client.models import PointStruct
-
-    client = vector_service.get_qdrant_client()
-    await client.upsert(
-        collection_name=vector_service.COLLECTION_NAME,
-        points=[
-            PointStruct(
-                id=str(job_id),
-                vector=embedding,
-                payload={"tenant_id": str(tenant_id), "type": "job"},
-            )
-        ],
+    await vector_service.upsert_job_embedding(
+        job_id=job_id,
+        tenant_id=tenant_id,
+        embedding=embedding,
+        sparse_embedding=sparse_embedding,
     )
     logger.info("Stored embedding for job %s (tenant %s)", job_id, tenant_id)
     return str(job_id)
@@ -120,27 +228,27 @@ async def get_embedding_vector(point_id: str) -> list[float]:
     points = await client.retrieve(
         collection_name=vector_service.COLLECTION_NAME,
         ids=[point_id],
-        with_vectors=True,
+        with_vectors=vector_service.dense_vector_selector(),
+        with_payload=False,
     )
     if not points:
         raise ValueError(f"Embedding not found for point {point_id}")
-    return points[0].vector
+    return vector_service.dense_vector(points[0].vector)
 
 
-async def retrieve_resume_chunks(
-    resume_id: UUID,
+async def retrieve_resume_chunks_batch(
+    resume_ids: list[UUID],
     job_embedding: list[float],
     top_k: int = 5,
-) -> str:
-    """Retrieve the most relevant chunks for a resume given a job embedding.
+) -> list[str]:
+    """Retrieve the most relevant chunks for each resume given a job embedding.
 
-    Returns assembled text from top-K matching chunks.
+    One batched Qdrant round trip for all resumes. Returns the assembled text
+    of each resume's top-K chunks ("" if none), in input order.
     """
-    chunks = await vector_service.find_resume_chunks(
-        resume_id=resume_id,
+    chunk_lists = await vector_service.find_resume_chunks_batch(
+        resume_ids=resume_ids,
         job_embedding=job_embedding,
         top_k=top_k,
     )
-    if not chunks:
-        return ""
-    return "\n\n".join(chunks)
+    return ["\n\n".join(chunks) for chunks in chunk_lists]
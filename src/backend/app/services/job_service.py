@@ -0,0 +1,77 @@
+"""Tenant-scoped job lookups, cached in-process.
+
+Jobs are read on every PDF upload, results fetch and screening run but never
+change after creation, so a short-lived per-process cache saves a DB round
+trip on each of those paths.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from uuid import UUID
+
+from cachetools import TTLCache
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.orm import Job
+
+JOB_CACHE_SIZE = 1024
+JOB_CACHE_TTL_SECONDS = 30
+
+
+@dataclass(frozen=True, slots=True)
+class JobProjection:
+    """Read-only snapshot of the job columns the API and screening need."""
+
+    id: UUID
+    tenant_id: UUID
+    title: str
+    description: str
+    requirements: tuple[str, ...]
+    embedding_id: str | None
+    status: str
+    created_at: datetime
+
+
+# Keyed by (tenant_id, job_id) so a lookup can never cross tenants.
+# Only found jobs are cached: a job created on another worker is visible at once.
+_job_cache: TTLCache[tuple[UUID, UUID], JobProjection] = TTLCache(
+    maxsize=JOB_CACHE_SIZE, ttl=JOB_CACHE_TTL_SECONDS
+)
+
+
+async def get_job_cached(db: AsyncSession, tenant_id: UUID, job_id: UUID) -> JobProjection | None:
+    """Load a job by id for the given tenant, or None if it doesn't exist."""
+    key = (tenant_id, job_id)
+    job = _job_cache.get(key)
+    if job is not None:
+        return job
+
+    result = await db.execute(
+        select(
+            Job.id,
+            Job.tenant_id,
+            Job.title,
+            Job.description,
+            Job.requirements,
+            Job.embedding_id,
+            Job.status,
+            Job.created_at,
+        ).where(Job.id == job_id, Job.tenant_id == tenant_id)
+    )
+    row = result.one_or_none()
+    if row is None:
+        return None
+
+    job = JobProjection(
+        id=row.id,
+        tenant_id=row.tenant_id,
+        title=row.title,
+        description=row.description,
+        requirements=tuple(row.requirements or ()),
+        embedding_id=row.embedding_id,
+        status=row.status,
+        created_at=row.created_at,
+    )
+    _job_cache[key] = job
+    return job
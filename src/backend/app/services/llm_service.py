@@ -1,30 +1,76 @@
-"""LLM integration via LangChain + OpenAI with cost tracking."""
+"""LLM integration via LangChain + OpenAI (structured outputs) with cost tracking."""
 
-import json
 import logging
 from uuid import UUID
 
+import openai
+import orjson
 import redis.asyncio as redis
 from langchain_openai import ChatOpenAI
 from langchain_core.messages import SystemMessage, HumanMessage
+from langchain_core.runnables import Runnable
+from langchain_core.utils.function_calling import convert_to_openai_function
+from pydantic import ValidationError
 
 from app.core.config import settings
-from app.models.schemas import ScreeningScore
+from app.core.http_client import get_http_client, get_openai_client
+from app.models.schemas import ScreeningScore, parse_llm_score
 from app.prompts.resume_screening import PROMPT_VERSION, build_screening_prompt
 
 logger = logging.getLogger(__name__)
 
 _redis_client: redis.Redis | None = None
+_llm: ChatOpenAI | None = None
+_structured_llm: Runnable | None = None
+_response_format: dict | None = None
+
+# Chat Completions parameters, shared by live calls and Batch API requests
+MAX_OUTPUT_TOKENS = 1500
 
 
 def get_llm() -> ChatOpenAI:
-    """Create a ChatOpenAI instance (stateless, no need to cache)."""
-    return ChatOpenAI(
-        model=settings.openai_model,
-        api_key=settings.openai_api_key,
-        temperature=0,
-        max_tokens=1500,
-    )
+    """Get or create the ChatOpenAI instance.
+
+    Cached so every call reuses the same OpenAI client and its pooled
+    connections instead of building a new client (and TLS session) per call.
+    """
+    global _llm
+    if _llm is None:
+        _llm = ChatOpenAI(
+            model=settings.openai_model,
+            api_key=settings.openai_api_key,
+            temperature=0,
+            max_tokens=MAX_OUTPUT_TOKENS,
+            # The OpenAI client retries 429s with backoff, honouring Retry-After
+            max_retries=settings.openai_max_retries,
+            http_async_client=get_http_client(),
+        )
+    return _llm
+
+
+def get_structured_llm() -> Runnable:
+    """Get the LLM bound to OpenAI structured outputs for ScreeningScore.
+
+    The API enforces the JSON schema server-side, so replies never need
+    fence stripping or re-parsing. include_raw keeps the raw message around
+    for token usage.
+    """
+    global _structured_llm
+    if _structured_llm is None:
+        _structured_llm = get_llm().with_structured_output(
+            ScreeningScore,
+            method="json_schema",
+            strict=True,
+            include_raw=True,
+        )
+    return _structured_llm
+
+
+def reset_llm() -> None:
+    """Drop the cached LLM wrappers (called on shutdown, with the HTTP client they hold)."""
+    global _llm, _structured_llm
+    _llm = None
+    _structured_llm = None
 
 
 def get_redis_client() -> redis.Redis:
@@ -44,21 +90,23 @@ async def check_tenant_budget(tenant_id: UUID) -> bool:
     return int(current) < settings.default_monthly_llm_budget
 
 
-async def increment_tenant_usage(tenant_id: UUID, tokens: int) -> None:
-    """Track LLM usage per tenant per month."""
-    r = get_redis_client()
-    key = f"tenant:{tenant_id}:llm_calls_month"
-    pipe = r.pipeline()
-    pipe.incr(key)
-    pipe.expire(key, 60 * 60 * 24 * 31)  # expire after ~1 month
-    await pipe.execute()
+async def charge_tenant(tenant_id: UUID, tokens: int) -> int:
+    """Record one LLM call and its tokens for the tenant's monthly usage.
 
-    # Also track token usage for billing
-    token_key = f"tenant:{tenant_id}:tokens_month"
+    Both counters are updated in a single MULTI round trip. Returns the
+    tenant's call count for the month, including this call.
+    """
+    r = get_redis_client()
+    calls_key = f"tenant:{tenant_id}:llm_calls_month"
+    token_key = f"tenant:{tenant_id}:tokens_month"  # token usage for billing
+    ttl = 60 * 60 * 24 * 31  # expire after ~1 month
     pipe = r.pipeline()
+    pipe.incr(calls_key)
+    pipe.expire(calls_key, ttl)
     pipe.incrby(token_key, tokens)
-    pipe.expire(token_key, 60 * 60 * 24 * 31)
-    await pipe.execute()
+    pipe.expire(token_key, ttl)
+    calls, *_ = await pipe.execute()
+    return calls
 
 
 async def score_resume(
@@ -69,52 +117,140 @@ async def score_resume(
 ) -> tuple[ScreeningScore, str, str, int]:
     """Score a single resume against a job description using LangChain + OpenAI.
 
+    Callers check the tenant budget (check_tenant_budget) once per batch
+    before scoring; this only records the usage.
+
     Returns (parsed_score, model_used, prompt_version, tokens_used).
-    Raises ValueError if budget exceeded or LLM returns invalid output.
+    Raises ValueError if the LLM returns invalid output.
     """
-    if not await check_tenant_budget(tenant_id):
-        raise ValueError("Monthly LLM budget exceeded for this tenant")
-
     system_prompt, user_prompt = build_screening_prompt(
         job_title=job_title,
         job_description=job_description,
         resume_text=resume_text,
     )
 
-    llm = get_llm()
     messages = [
         SystemMessage(content=system_prompt),
         HumanMessage(content=user_prompt),
     ]
 
-    response = await llm.ainvoke(messages)
-
-    raw_text = response.content
-    logger.info("LLM raw response: %s", raw_text[:500])
+    try:
+        result = await get_structured_llm().ainvoke(messages)
+    except (ValidationError, openai.LengthFinishReasonError, openai.ContentFilterFinishReasonError) as exc:
+        # The SDK parses the reply itself; it only fails on truncated or filtered output
+        logger.error("LLM returned no valid score: %s", exc)
+        raise ValueError(f"LLM output failed validation: {exc}") from exc
+    response = result["raw"]
 
     # Extract token usage from response metadata
     usage = response.response_metadata.get("token_usage", {})
     tokens_used = usage.get("total_tokens", 0)
 
     # Track usage
-    await increment_tenant_usage(tenant_id, tokens_used)
-
-    # Strip markdown code fences if GPT wraps the JSON
-    text = raw_text.strip()
-    if text.startswith("```"):
-        # Remove opening ```json or ``` and closing ```
-        lines = text.split("\n")
-        lines = lines[1:]  # drop opening fence
-        if lines and lines[-1].strip() == "```":
-            lines = lines[:-1]  # drop closing fence
-        text = "\n".join(lines)
-
-    # Parse and validate structured output
-    try:
-        parsed = json.loads(text)
-        score = ScreeningScore.model_validate(parsed)
-    except (json.JSONDecodeError, Exception) as exc:
-        logger.error("LLM returned invalid JSON: %s", raw_text[:500])
-        raise ValueError(f"LLM output failed validation: {exc}") from exc
+    calls = await charge_tenant(tenant_id, tokens_used)
+    if calls > settings.default_monthly_llm_budget:
+        logger.warning("Tenant %s is over its monthly LLM budget (%d calls)", tenant_id, calls)
+
+    # A refusal comes back as raw content with nothing parsed
+    score = result["parsed"]
+    if score is None:
+        logger.error("LLM returned no valid score: %s", str(response.content)[:500])
+        raise ValueError(f"LLM output failed validation: {result['parsing_error']}")
 
     return score, settings.openai_model, PROMPT_VERSION, tokens_used
+
+
+# --- Batch API (offline screening at half the per-token price) ---
+
+
+def _screening_response_format() -> dict:
+    """The strict json_schema response_format that get_structured_llm() sends."""
+    global _response_format
+    if _response_format is None:
+        function = convert_to_openai_function(ScreeningScore, strict=True)
+        _response_format = {
+            "type": "json_schema",
+            "json_schema": {
+                "name": function["name"],
+                "schema": function["parameters"],
+                "strict": True,
+            },
+        }
+    return _response_format
+
+
+def build_batch_request(
+    custom_id: str,
+    job_title: str,
+    job_description: str,
+    resume_text: str,
+) -> dict:
+    """One Batch API input line: the same chat completion score_resume would send."""
+    system_prompt, user_prompt = build_screening_prompt(
+        job_title=job_title,
+        job_description=job_description,
+        resume_text=resume_text,
+    )
+    return {
+        "custom_id": custom_id,
+        "method": "POST",
+        "url": "/v1/chat/completions",
+        "body": {
+            "model": settings.openai_model,
+            "temperature": 0,
+            "max_tokens": MAX_OUTPUT_TOKENS,
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt},
+            ],
+            "response_format": _screening_response_format(),
+        },
+    }
+
+
+async def submit_batch(requests: list[dict], metadata: dict[str, str]) -> str:
+    """Upload the requests as JSONL and start a 24h Batch API job. Returns the batch id."""
+    client = get_openai_client()
+    jsonl = b"\n".join(orjson.dumps(request) for request in requests)
+    input_file = await client.files.create(file=("screening.jsonl", jsonl), purpose="batch")
+    batch = await client.batches.create(
+        input_file_id=input_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h",
+        metadata=metadata,
+    )
+    logger.info("Submitted batch %s with %d requests", batch.id, len(requests))
+    return batch.id
+
+
+async def fetch_batch_results(batch_id: str) -> tuple[str, dict[str, tuple[ScreeningScore, int]]]:
+    """Get a batch's status and, once completed, its parsed scores.
+
+    Returns (status, {custom_id: (score, tokens_used)}). Results are empty
+    until the status is "completed"; requests that failed or returned an
+    invalid score are logged and left out.
+    """
+    client = get_openai_client()
+    batch = await client.batches.retrieve(batch_id)
+    if batch.status != "completed" or batch.output_file_id is None:
+        return batch.status, {}
+
+    content = await client.files.content(batch.output_file_id)
+    results: dict[str, tuple[ScreeningScore, int]] = {}
+    for line in content.content.splitlines():
+        if not line:
+            continue
+        entry = orjson.loads(line)
+        custom_id = entry["custom_id"]
+        response = entry.get("response") or {}
+        if entry.get("error") or response.get("status_code") != 200:
+            logger.error("Batch %s request %s failed: %s", batch_id, custom_id, entry.get("error"))
+            continue
+        body = response["body"]
+        try:
+            score = parse_llm_score(body["choices"][0]["message"]["content"] or "")
+        except ValidationError:
+            logger.error("Batch %s request %s returned no valid score", batch_id, custom_id)
+            continue
+        results[custom_id] = (score, body.get("usage", {}).get("total_tokens", 0))
+    return batch.status, results
@@ -1,11 +1,21 @@
 """PDF text extraction using PyMuPDF."""
 
+import anyio.to_thread
 import fitz  # PyMuPDF
 
 
 def extract_text_from_pdf(pdf_bytes: bytes) -> str:
     """Extract all text from a PDF file's bytes."""
-    doc = fitz.open(stream=pdf_bytes, filetype="pdf")
-    pages = [page.get_text() for page in doc]
-    doc.close()
-    return "\n".join(pages).strip()
+    # Context manager releases the native document even if a page fails to parse
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+        # Plain text in content-stream order: no images, no reading-order sort
+        text = "\n".join(page.get_text("text", sort=False) for page in doc)
+    return text.strip()
+
+
+async def extract_text_from_pdf_async(pdf_bytes: bytes) -> str:
+    """Extract text on a worker thread so parsing doesn't block the event loop.
+
+    Runs on the shared thread pool sized by AURA_WORKER_THREADS.
+    """
+    return await anyio.to_thread.run_sync(extract_text_from_pdf, pdf_bytes)
@@ -1,49 +1,100 @@
 """Orchestrator: ties together vector search, caching, LLM scoring, and persistence."""
 
+import asyncio
 import logging
-from uuid import UUID
+from datetime import datetime
+from uuid import UUID, uuid4
 
+import msgpack
 from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.orm import Job, Resume, ScreeningResult
-from app.models.schemas import ScreeningResultResponse, ScreeningScore, ScreeningSummary
-from app.services import cache_service, embedding_service, llm_service, vector_service
+from app.core.config import settings
+from app.models.orm import Resume, ScreeningResult
+from app.models.schemas import (
+    BatchScreeningStatus,
+    ScreeningResultResponse,
+    ScreeningScore,
+    ScreeningSummary,
+)
+from app.prompts.resume_screening import PROMPT_VERSION
+from app.services import cache_service, embedding_service, job_service, llm_service, vector_service
+from app.services.job_service import JobProjection
 
 logger = logging.getLogger(__name__)
 
+# How long a submitted batch can be collected (the Batch API window is 24h)
+BATCH_RECORD_TTL = 3 * 86400
 
-async def screen_candidates(
-    db: AsyncSession,
+# Columns overwritten when a (job, resume) pair is screened again
+_UPSERT_COLUMNS = (
+    "score",
+    "strengths",
+    "weaknesses",
+    "reasoning",
+    "experience_match",
+    "skills_match",
+    "model_used",
+    "prompt_version",
+    "tokens_used",
+)
+
+
+async def _score_resume(
     tenant_id: UUID,
-    job_id: UUID,
-    resume_ids: list[UUID] | None = None,
-) -> ScreeningSummary:
-    """Screen candidates for a job. Main orchestration flow:
+    job: JobProjection,
+    resume: Resume,
+    jd_hash: str,
+    resume_text: str,
+) -> tuple[ScreeningScore, str, str, int]:
+    """Score one uncached resume with the LLM, then cache the score.
 
-    1. Load job description (tenant-scoped)
-    2. If no resume_ids provided, use vector search to find top-N matches
-    3. For each resume: check cache -> call LLM if miss -> persist result
-    4. Return ranked results
+    `resume_text` is the RAG-selected chunk text, or the full resume text.
+    Only touches Redis and OpenAI (never the DB session), so calls for
+    different resumes can run concurrently.
+
+    Returns (score, model_used, prompt_version, tokens_used).
     """
-    # 1. Load job (tenant-scoped query)
-    job = await db.execute(
-        select(Job).where(Job.id == job_id, Job.tenant_id == tenant_id)
+    # Call LLM
+    score_data, model_used, prompt_version, tokens_used = (
+        await llm_service.score_resume(
+            tenant_id=tenant_id,
+            job_title=job.title,
+            job_description=job.description,
+            resume_text=resume_text,
+        )
     )
-    job = job.scalar_one_or_none()
-    if job is None:
-        raise ValueError(f"Job {job_id} not found for this tenant")
+    # Cache the result
+    await cache_service.set_cached_score(
+        tenant_id, job.id, resume.id, jd_hash, score_data
+    )
+    return score_data, model_used, prompt_version, tokens_used
 
-    jd_hash = cache_service.hash_jd(job.description)
 
-    # 2. Determine which resumes to score
+async def _select_resumes(
+    db: AsyncSession,
+    tenant_id: UUID,
+    job: JobProjection,
+    resume_ids: list[UUID] | None,
+) -> tuple[list[Resume], list[float] | None]:
+    """Load the resumes to screen (tenant-scoped).
+
+    Without explicit resume_ids, uses vector search to pick the top-N matches.
+    Also returns the job embedding if it had to be fetched for that.
+    """
+    job_embedding: list[float] | None = None
     if resume_ids is None:
         # Use vector similarity to pre-filter (cost control)
         if job.embedding_id:
             job_embedding = await embedding_service.get_embedding_vector(job.embedding_id)
+            job_sparse = None
+            if settings.hybrid_search:
+                job_sparse = await embedding_service.embed_sparse_query(job.description)
             similar_ids = await vector_service.find_similar_resumes(
                 tenant_id=tenant_id,
                 job_embedding=job_embedding,
+                job_sparse=job_sparse,
             )
             resume_ids = [UUID(rid) for rid in similar_ids]
         else:
@@ -55,101 +106,89 @@ async def screen_candidates(
             )
             resume_ids = list(result.scalars().all())
 
-    # 3. Load resumes (tenant-scoped)
     resumes_result = await db.execute(
         select(Resume).where(
             Resume.id.in_(resume_ids),
             Resume.tenant_id == tenant_id,  # enforce isolation
         )
     )
-    resumes = list(resumes_result.scalars().all())
+    return list(resumes_result.scalars().all()), job_embedding
 
-    # 4. Score each resume
-    results: list[ScreeningResultResponse] = []
-    for resume in resumes:
-        # Check cache first
-        cached = await cache_service.get_cached_score(
-            tenant_id, job_id, resume.id, jd_hash
-        )
-        if cached is not None:
-            logger.info("Cache hit for resume %s", resume.id)
-            score_data = cached
-            model_used = "cached"
-            prompt_version = "cached"
-            tokens_used = 0
-        else:
-            # RAG: retrieve relevant chunks if available, else use full text
-            resume_text = resume.raw_text
-            if job.embedding_id:
-                try:
-                    job_emb = await embedding_service.get_embedding_vector(job.embedding_id)
-                    rag_text = await embedding_service.retrieve_resume_chunks(
-                        resume_id=resume.id,
-                        job_embedding=job_emb,
-                        top_k=5,
-                    )
-                    if rag_text:
-                        resume_text = rag_text
-                except Exception:
-                    logger.warning("RAG retrieval failed for resume %s, using full text", resume.id)
-
-            # Call LLM
-            score_data, model_used, prompt_version, tokens_used = (
-                await llm_service.score_resume(
-                    tenant_id=tenant_id,
-                    job_title=job.title,
-                    job_description=job.description,
-                    resume_text=resume_text,
-                )
-            )
-            # Cache the result
-            await cache_service.set_cached_score(
-                tenant_id, job_id, resume.id, jd_hash, score_data
-            )
 
-        # Persist to DB (upsert)
-        existing = await db.execute(
-            select(ScreeningResult).where(
-                ScreeningResult.job_id == job_id,
-                ScreeningResult.resume_id == resume.id,
-            )
-        )
-        existing_row = existing.scalar_one_or_none()
-
-        if existing_row:
-            existing_row.score = score_data.score
-            existing_row.strengths = [s.model_dump() for s in score_data.strengths]
-            existing_row.weaknesses = [w.model_dump() for w in score_data.weaknesses]
-            existing_row.reasoning = score_data.reasoning
-            existing_row.experience_match = score_data.experience_match.value
-            existing_row.skills_match = score_data.skills_match.value
-            existing_row.model_used = model_used
-            existing_row.prompt_version = prompt_version
-            existing_row.tokens_used = tokens_used
-            db_row = existing_row
-        else:
-            db_row = ScreeningResult(
-                tenant_id=tenant_id,
-                job_id=job_id,
-                resume_id=resume.id,
-                score=score_data.score,
-                strengths=[s.model_dump() for s in score_data.strengths],
-                weaknesses=[w.model_dump() for w in score_data.weaknesses],
-                reasoning=score_data.reasoning,
-                experience_match=score_data.experience_match.value,
-                skills_match=score_data.skills_match.value,
-                model_used=model_used,
-                prompt_version=prompt_version,
-                tokens_used=tokens_used,
+async def _prepare_resume_texts(
+    job: JobProjection,
+    resumes: list[Resume],
+    job_embedding: list[float] | None,
+) -> list[str]:
+    """Text to send the LLM for each resume: RAG chunks, else the full text.
+
+    The job embedding is fetched at most once and every chunk search goes to
+    Qdrant as one batch.
+    """
+    resume_texts = [resume.raw_text for resume in resumes]
+    if resumes and job.embedding_id:
+        try:
+            if job_embedding is None:
+                job_embedding = await embedding_service.get_embedding_vector(job.embedding_id)
+            rag_texts = await embedding_service.retrieve_resume_chunks_batch(
+                resume_ids=[resume.id for resume in resumes],
+                job_embedding=job_embedding,
+                top_k=5,
             )
-            db.add(db_row)
+            resume_texts = [rag or full for rag, full in zip(rag_texts, resume_texts)]
+        except Exception:
+            logger.warning("RAG retrieval failed for job %s, using full resume text", job.id)
+    return resume_texts
 
-        await db.flush()
 
+async def _persist_results(
+    db: AsyncSession,
+    tenant_id: UUID,
+    job: JobProjection,
+    resumes: list[Resume],
+    scored: list[tuple[ScreeningScore, str, str, int]],
+) -> ScreeningSummary:
+    """Upsert scored results, commit, and return them ranked."""
+    # One INSERT ... ON CONFLICT (job_id, resume_id) DO UPDATE for the batch.
+    # Re-screened pairs keep their original id and created_at; RETURNING
+    # hands back whichever id/created_at each row ended up with.
+    now = datetime.utcnow()
+    rows = [
+        {
+            "id": uuid4(),
+            "tenant_id": tenant_id,
+            "job_id": job.id,
+            "resume_id": resume.id,
+            "score": score_data.score,
+            "strengths": [s.model_dump() for s in score_data.strengths],
+            "weaknesses": [w.model_dump() for w in score_data.weaknesses],
+            "reasoning": score_data.reasoning,
+            "experience_match": score_data.experience_match.value,
+            "skills_match": score_data.skills_match.value,
+            "model_used": model_used,
+            "prompt_version": prompt_version,
+            "tokens_used": tokens_used,
+            "created_at": now,
+        }
+        for resume, (score_data, model_used, prompt_version, tokens_used) in zip(resumes, scored)
+    ]
+    persisted: dict[UUID, tuple[UUID, datetime]] = {}
+    if rows:
+        stmt = insert(ScreeningResult).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_job_resume",
+            set_={column: stmt.excluded[column] for column in _UPSERT_COLUMNS},
+        ).returning(ScreeningResult.resume_id, ScreeningResult.id, ScreeningResult.created_at)
+        upserted = await db.execute(stmt)
+        persisted = {resume_id: (row_id, created_at) for resume_id, row_id, created_at in upserted}
+
+    results: list[ScreeningResultResponse] = []
+    for resume, (score_data, model_used, _, _) in zip(resumes, scored):
+        result_id, created_at = persisted[resume.id]
         results.append(
             ScreeningResultResponse(
-                id=db_row.id,
-                job_id=job_id,
+                id=result_id,
+                job_id=job.id,
                 resume_id=resume.id,
                 candidate_name=resume.candidate_name,
                 score=score_data.score,
@@ -159,7 +198,7 @@ async def screen_candidates(
                 experience_match=score_data.experience_match,
                 skills_match=score_data.skills_match,
                 model_used=model_used,
-                created_at=db_row.created_at,
+                created_at=created_at,
             )
         )
 
@@ -169,8 +208,198 @@ async def screen_candidates(
     results.sort(key=lambda r: r.score, reverse=True)
 
     return ScreeningSummary(
-        job_id=job_id,
+        job_id=job.id,
         job_title=job.title,
         total_candidates=len(results),
         results=results,
     )
+
+
+async def screen_candidates(
+    db: AsyncSession,
+    tenant_id: UUID,
+    job_id: UUID,
+    resume_ids: list[UUID] | None = None,
+) -> ScreeningSummary:
+    """Screen candidates for a job. Main orchestration flow:
+
+    1. Load job description (tenant-scoped)
+    2. If no resume_ids provided, use vector search to find top-N matches
+    3. Check the cache; check the tenant budget once if anything must be scored
+    4. Retrieve RAG chunks for all cache misses in one batched search
+    5. Score cache misses concurrently with the LLM
+    6. Persist results and return them ranked
+    """
+    # 1. Load job (tenant-scoped, cached per process)
+    job = await job_service.get_job_cached(db, tenant_id, job_id)
+    if job is None:
+        raise ValueError(f"Job {job_id} not found for this tenant")
+
+    jd_hash = cache_service.hash_jd(job.description)
+
+    # 2. Determine which resumes to score
+    resumes, job_embedding = await _select_resumes(db, tenant_id, job, resume_ids)
+
+    # 3. Check the cache first; only misses need the LLM
+    cached_scores = await asyncio.gather(
+        *(cache_service.get_cached_score(tenant_id, job.id, resume.id, jd_hash) for resume in resumes)
+    )
+    scored: list[tuple[ScreeningScore, str, str, int] | None] = [
+        (cached, "cached", "cached", 0) if cached is not None else None
+        for cached in cached_scores
+    ]
+    misses = [i for i, entry in enumerate(scored) if entry is None]
+    logger.info("Screening job %s: %d cache hits, %d to score", job_id, len(resumes) - len(misses), len(misses))
+
+    # Budget is tenant-level: check it once for the whole batch
+    if misses and not await llm_service.check_tenant_budget(tenant_id):
+        raise ValueError("Monthly LLM budget exceeded for this tenant")
+
+    # 4. RAG context for the misses
+    resume_texts = await _prepare_resume_texts(job, [resumes[i] for i in misses], job_embedding)
+
+    # 5. Score misses concurrently, bounded to stay within OpenAI rate limits
+    semaphore = asyncio.Semaphore(settings.llm_max_concurrency)
+
+    async def score_bounded(resume: Resume, resume_text: str) -> tuple[ScreeningScore, str, str, int]:
+        async with semaphore:
+            return await _score_resume(tenant_id, job, resume, jd_hash, resume_text)
+
+    fresh = await asyncio.gather(
+        *(score_bounded(resumes[i], text) for i, text in zip(misses, resume_texts))
+    )
+    for i, entry in zip(misses, fresh):
+        scored[i] = entry
+
+    # 6. Persist and rank
+    return await _persist_results(db, tenant_id, job, resumes, scored)
+
+
+# --- Batch API screening (offline, half price, results within 24h) ---
+
+
+def _batch_key(tenant_id: UUID, batch_id: str) -> str:
+    return f"tenant:{tenant_id}:screen_batch:{batch_id}"
+
+
+async def submit_batch_screening(
+    db: AsyncSession,
+    tenant_id: UUID,
+    job_id: UUID,
+    resume_ids: list[UUID] | None = None,
+) -> BatchScreeningStatus:
+    """Queue a screening on the OpenAI Batch API instead of scoring inline.
+
+    Selects resumes and builds prompts exactly like screen_candidates, but
+    only submits the cache misses and returns straight away. Poll
+    collect_batch_screening with the returned batch id for the results.
+    """
+    job = await job_service.get_job_cached(db, tenant_id, job_id)
+    if job is None:
+        raise ValueError(f"Job {job_id} not found for this tenant")
+
+    jd_hash = cache_service.hash_jd(job.description)
+    resumes, job_embedding = await _select_resumes(db, tenant_id, job, resume_ids)
+
+    cached_scores = await asyncio.gather(
+        *(cache_service.get_cached_score(tenant_id, job.id, resume.id, jd_hash) for resume in resumes)
+    )
+    misses = [resume for resume, cached in zip(resumes, cached_scores) if cached is None]
+    if not misses:
+        raise ValueError("All selected resumes are already scored for this job")
+    if not await llm_service.check_tenant_budget(tenant_id):
+        raise ValueError("Monthly LLM budget exceeded for this tenant")
+
+    resume_texts = await _prepare_resume_texts(job, misses, job_embedding)
+    requests = [
+        llm_service.build_batch_request(
+            custom_id=str(resume.id),
+            job_title=job.title,
+            job_description=job.description,
+            resume_text=text,
+        )
+        for resume, text in zip(misses, resume_texts)
+    ]
+    batch_id = await llm_service.submit_batch(
+        requests, metadata={"tenant_id": str(tenant_id), "job_id": str(job_id)}
+    )
+
+    # Remember which tenant/job the batch belongs to; the key is tenant-scoped,
+    # so another tenant can never collect it
+    await cache_service.get_redis().set(
+        _batch_key(tenant_id, batch_id),
+        msgpack.packb({"job_id": str(job_id), "jd_hash": jd_hash, "total": len(requests)}, use_bin_type=True),
+        ex=BATCH_RECORD_TTL,
+    )
+    return BatchScreeningStatus(
+        batch_id=batch_id, job_id=job_id, status="submitted", total_candidates=len(requests)
+    )
+
+
+async def collect_batch_screening(
+    db: AsyncSession,
+    tenant_id: UUID,
+    batch_id: str,
+) -> BatchScreeningStatus:
+    """Check a batch screening; once complete, cache, charge and persist its scores.
+
+    Results are collected exactly once. Afterwards the batch is forgotten and
+    the scores are available from GET /results/{job_id}.
+    """
+    r = cache_service.get_redis()
+    key = _batch_key(tenant_id, batch_id)
+    data = await r.get(key)
+    if data is None:
+        raise LookupError(f"Batch {batch_id} not found for this tenant")
+    record = msgpack.unpackb(data, raw=False)
+    job_id = UUID(record["job_id"])
+
+    status, scores = await llm_service.fetch_batch_results(batch_id)
+    if status != "completed":
+        return BatchScreeningStatus(
+            batch_id=batch_id, job_id=job_id, status=status, total_candidates=record["total"]
+        )
+
+    # Looked up before claiming: a missing job must leave the batch collectable
+    job = await job_service.get_job_cached(db, tenant_id, job_id)
+    if job is None:
+        raise LookupError(f"Job {job_id} not found for this tenant")
+
+    # Claim the batch so concurrent polls don't persist and charge it twice
+    if not await r.delete(key):
+        raise LookupError(f"Batch {batch_id} not found for this tenant")
+
+    try:
+        resumes_result = await db.execute(
+            select(Resume).where(
+                Resume.id.in_([UUID(resume_id) for resume_id in scores]),
+                Resume.tenant_id == tenant_id,  # enforce isolation
+            )
+        )
+        resumes = list(resumes_result.scalars().all())
+
+        scored: list[tuple[ScreeningScore, str, str, int]] = []
+        for resume in resumes:
+            score_data, tokens_used = scores[str(resume.id)]
+            scored.append((score_data, settings.openai_model, PROMPT_VERSION, tokens_used))
+
+        summary = await _persist_results(db, tenant_id, job, resumes, scored)
+    except Exception:
+        # Put the claim back so the batch can be collected again
+        await r.set(key, data, ex=BATCH_RECORD_TTL)
+        raise
+
+    await asyncio.gather(
+        *(llm_service.charge_tenant(tenant_id, tokens_used) for _, _, _, tokens_used in scored),
+        *(
+            cache_service.set_cached_score(tenant_id, job.id, resume.id, record["jd_hash"], score_data)
+            for resume, (score_data, _, _, _) in zip(resumes, scored)
+        ),
+    )
+    return BatchScreeningStatus(
+        batch_id=batch_id,
+        job_id=job_id,
+        status=status,
+        total_candidates=record["total"],
+        summary=summary,
+    )
@@ -2,19 +2,42 @@
 
 Supports chunked resume storage -- each resume is split into multiple chunks,
 each stored as a separate vector with metadata linking back to the resume.
+
+With AURA_HYBRID_SEARCH enabled, points carry a named dense vector plus a BM25
+sparse vector, and the resume pre-filter fuses both rankings with RRF so exact
+skill keywords are not lost to purely semantic matching.
 """
 
+import asyncio
+import hashlib
 import logging
 import uuid as uuid_mod
 from uuid import UUID
 
 from qdrant_client import AsyncQdrantClient
 from qdrant_client.models import (
+    BinaryQuantization,
+    BinaryQuantizationConfig,
     Distance,
     FieldCondition,
     Filter,
+    Fusion,
+    FusionQuery,
     MatchValue,
+    Modifier,
+    PayloadSchemaType,
     PointStruct,
+    Prefetch,
+    QuantizationConfig,
+    QuantizationSearchParams,
+    QueryRequest,
+    QueryResponse,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+    SearchParams,
+    SparseVector,
+    SparseVectorParams,
     VectorParams,
 )
 
@@ -23,34 +46,169 @@ from app.core.config import settings
 logger = logging.getLogger(__name__)
 
 COLLECTION_NAME = "resumes"
-VECTOR_DIM = 1536  # text-embedding-3-small dimension
+OPENAI_EMBEDDING_DIM = 1536  # text-embedding-3-small dimension
+
+
+def fastembed_dim(model_name: str) -> int:
+    """Vector size of a FastEmbed model, from its registry entry (no download)."""
+    from fastembed import TextEmbedding
+
+    for entry in TextEmbedding.list_supported_models():
+        if entry["model"].lower() == model_name.lower():
+            return entry["dim"]
+    raise ValueError(f"Unsupported FastEmbed model: {model_name}")
+
+
+VECTOR_DIM = fastembed_dim(settings.fastembed_model) if settings.use_fastembed else OPENAI_EMBEDDING_DIM
+
+# Named vectors, only used when hybrid search is enabled
+DENSE_VECTOR_NAME = "dense"
+SPARSE_VECTOR_NAME = "bm25"
+
+# Scan quantized vectors, then rescore the top 2x candidates with the originals
+QUANTIZED_SEARCH_PARAMS = SearchParams(
+    quantization=QuantizationSearchParams(rescore=True, oversampling=2.0),
+)
+
+# Upsert batching: 32 points per request, at most 2 requests in flight
+UPSERT_BATCH_SIZE = 32
+UPSERT_MAX_CONCURRENCY = 2
+
+# Keyword payload indexes for the fields every search filters on. Plain schema
+# types, because qdrant-client 1.11 cannot send KeywordIndexParams over gRPC.
+PAYLOAD_INDEXES = {
+    "tenant_id": PayloadSchemaType.KEYWORD,
+    "resume_id": PayloadSchemaType.KEYWORD,
+    "type": PayloadSchemaType.KEYWORD,
+}
+
+# Payload fields each search actually reads; everything else stays on the server
+RESUME_ID_PAYLOAD = ["resume_id"]
+CHUNK_TEXT_PAYLOAD = ["chunk_index", "chunk_text"]
+
+_CHUNK_ID_NAMESPACE = uuid_mod.NAMESPACE_DNS.bytes
 
 _qdrant_client: AsyncQdrantClient | None = None
+# Set once ensure_collection has succeeded in this process
+_collection_ready = False
 
 
 def get_qdrant_client() -> AsyncQdrantClient:
     global _qdrant_client
     if _qdrant_client is None:
-        _qdrant_client = AsyncQdrantClient(url=settings.qdrant_url)
+        _qdrant_client = AsyncQdrantClient(
+            url=settings.qdrant_url,
+            prefer_grpc=settings.qdrant_prefer_grpc,
+            grpc_port=settings.qdrant_grpc_port,
+        )
     return _qdrant_client
 
 
+def _quantization_config() -> QuantizationConfig | None:
+    """Build the collection quantization config from settings."""
+    if settings.qdrant_quantization == "scalar":
+        return ScalarQuantization(
+            scalar=ScalarQuantizationConfig(type=ScalarType.INT8, quantile=0.99, always_ram=True),
+        )
+    if settings.qdrant_quantization == "binary":
+        return BinaryQuantization(binary=BinaryQuantizationConfig(always_ram=True))
+    return None
+
+
 async def ensure_collection() -> None:
-    """Create the resumes collection if it doesn't exist."""
+    """Create the resumes collection and its payload indexes if they don't exist.
+
+    Runs before every ingest, but only checks Qdrant once per process.
+    """
+    global _collection_ready
+    if _collection_ready:
+        return
     client = get_qdrant_client()
     collections = await client.get_collections()
     names = [c.name for c in collections.collections]
     if COLLECTION_NAME not in names:
-        await client.create_collection(
+        dense_params = VectorParams(size=VECTOR_DIM, distance=Distance.COSINE)
+        if settings.hybrid_search:
+            await client.create_collection(
+                collection_name=COLLECTION_NAME,
+                vectors_config={DENSE_VECTOR_NAME: dense_params},
+                # BM25 term weights need IDF computed by Qdrant at query time
+                sparse_vectors_config={SPARSE_VECTOR_NAME: SparseVectorParams(modifier=Modifier.IDF)},
+                quantization_config=_quantization_config(),
+            )
+        else:
+            await client.create_collection(
+                collection_name=COLLECTION_NAME,
+                vectors_config=dense_params,
+                quantization_config=_quantization_config(),
+            )
+        logger.info("Created Qdrant collection: %s", COLLECTION_NAME)
+
+    # Also backfills indexes and quantization on collections created before them
+    info = await client.get_collection(COLLECTION_NAME)
+    quantization = _quantization_config()
+    if quantization is not None and info.config.quantization_config is None:
+        await client.update_collection(
             collection_name=COLLECTION_NAME,
-            vectors_config=VectorParams(size=VECTOR_DIM, distance=Distance.COSINE),
+            quantization_config=quantization,
         )
-        logger.info("Created Qdrant collection: %s", COLLECTION_NAME)
+        logger.info("Enabled %s quantization on %s", settings.qdrant_quantization, COLLECTION_NAME)
+    for field_name, field_schema in PAYLOAD_INDEXES.items():
+        if field_name not in info.payload_schema:
+            await client.create_payload_index(
+                collection_name=COLLECTION_NAME,
+                field_name=field_name,
+                field_schema=field_schema,
+            )
+            logger.info("Created payload index on %s.%s", COLLECTION_NAME, field_name)
+
+    _collection_ready = True
+
+
+def _dense_using() -> str | None:
+    """Name of the dense vector to query (None for the unnamed default vector)."""
+    return DENSE_VECTOR_NAME if settings.hybrid_search else None
+
+
+def _point_vector(
+    embedding: list[float],
+    sparse: SparseVector | None = None,
+) -> list[float] | dict:
+    """Build the vector field for a point, naming vectors when hybrid search is on."""
+    if not settings.hybrid_search:
+        return embedding
+    vectors: dict = {DENSE_VECTOR_NAME: embedding}
+    if sparse is not None:
+        vectors[SPARSE_VECTOR_NAME] = sparse
+    return vectors
+
+
+def dense_vector_selector() -> bool | list[str]:
+    """`with_vectors` value that fetches only the dense vector of a point."""
+    return [DENSE_VECTOR_NAME] if settings.hybrid_search else True
+
 
+def dense_vector(vector: list[float] | dict) -> list[float]:
+    """Extract the dense embedding from a retrieved point's vector field."""
+    if isinstance(vector, dict):
+        return vector[DENSE_VECTOR_NAME]
+    return vector
 
-def _chunk_point_id(resume_id: UUID, chunk_index: int) -> str:
-    """Generate a deterministic UUID for a resume chunk."""
-    return str(uuid_mod.uuid5(uuid_mod.NAMESPACE_DNS, f"{resume_id}:chunk:{chunk_index}"))
+
+def _chunk_point_ids(resume_id: UUID, count: int) -> list[str]:
+    """Generate deterministic UUIDs for the first `count` chunks of a resume.
+
+    blake2b over a shared namespace-seeded hash, copied per chunk, so each id
+    costs one short update instead of a full uuid5 (MD5) computation.
+    """
+    base = hashlib.blake2b(_CHUNK_ID_NAMESPACE, digest_size=16)
+    base.update(f"{resume_id}:chunk:".encode())
+    ids = []
+    for chunk_index in range(count):
+        h = base.copy()
+        h.update(str(chunk_index).encode())
+        ids.append(str(uuid_mod.UUID(bytes=h.digest())))
+    return ids
 
 
 async def upsert_resume_chunks(
@@ -58,13 +216,20 @@ async def upsert_resume_chunks(
     tenant_id: UUID,
     chunks: list[str],
     embeddings: list[list[float]],
+    sparse_embeddings: list[SparseVector] | None = None,
 ) -> None:
-    """Store multiple chunk embeddings for a single resume."""
+    """Store multiple chunk embeddings for a single resume.
+
+    Large resumes are split into UPSERT_BATCH_SIZE-point requests, sent with
+    bounded concurrency.
+    """
     client = get_qdrant_client()
+    if sparse_embeddings is None:
+        sparse_embeddings = [None] * len(chunks)
     points = [
         PointStruct(
-            id=_chunk_point_id(resume_id, i),
-            vector=embedding,
+            id=point_id,
+            vector=_point_vector(embedding, sparse),
             payload={
                 "tenant_id": str(tenant_id),
                 "resume_id": str(resume_id),
@@ -73,9 +238,40 @@ async def upsert_resume_chunks(
                 "type": "resume_chunk",
             },
         )
-        for i, (chunk, embedding) in enumerate(zip(chunks, embeddings))
+        for i, (point_id, chunk, embedding, sparse) in enumerate(
+            zip(_chunk_point_ids(resume_id, len(chunks)), chunks, embeddings, sparse_embeddings)
+        )
     ]
-    await client.upsert(collection_name=COLLECTION_NAME, points=points)
+    semaphore = asyncio.Semaphore(UPSERT_MAX_CONCURRENCY)
+
+    async def upsert_batch(batch: list[PointStruct]) -> None:
+        async with semaphore:
+            await client.upsert(collection_name=COLLECTION_NAME, points=batch)
+
+    await asyncio.gather(*(
+        upsert_batch(points[start:start + UPSERT_BATCH_SIZE])
+        for start in range(0, len(points), UPSERT_BATCH_SIZE)
+    ))
+
+
+async def upsert_job_embedding(
+    job_id: UUID,
+    tenant_id: UUID,
+    embedding: list[float],
+    sparse_embedding: SparseVector | None = None,
+) -> None:
+    """Store the embedding for a job description (single vector, no chunking)."""
+    client = get_qdrant_client()
+    await client.upsert(
+        collection_name=COLLECTION_NAME,
+        points=[
+            PointStruct(
+                id=str(job_id),
+                vector=_point_vector(embedding, sparse_embedding),
+                payload={"tenant_id": str(tenant_id), "type": "job"},
+            )
+        ],
+    )
 
 
 async def upsert_resume_embedding(
@@ -90,7 +286,7 @@ async def upsert_resume_embedding(
         points=[
             PointStruct(
                 id=str(resume_id),
-                vector=embedding,
+                vector=_point_vector(embedding),
                 payload={"tenant_id": str(tenant_id), "type": "resume"},
             )
         ],
@@ -101,30 +297,71 @@ async def find_similar_resumes(
     tenant_id: UUID,
     job_embedding: list[float],
     top_k: int | None = None,
+    job_sparse: SparseVector | None = None,
 ) -> list[str]:
     """Find the top-K most similar resume IDs for a given JD embedding.
 
     Searches across all chunk vectors and deduplicates by resume_id.
-    Results are filtered by tenant_id for isolation.
+    Results are filtered by tenant_id for isolation. When hybrid search is
+    enabled and a BM25 query vector is given, dense and sparse rankings are
+    fused with RRF.
     """
     if top_k is None:
         top_k = settings.max_resumes_per_screen
 
     client = get_qdrant_client()
-    # Search more chunks to ensure we get enough unique resumes
-    results = await client.query_points(
-        collection_name=COLLECTION_NAME,
-        query=job_embedding,
-        query_filter=Filter(
-            must=[
-                FieldCondition(
-                    key="tenant_id",
-                    match=MatchValue(value=str(tenant_id)),
-                )
-            ]
-        ),
-        limit=top_k * 5,  # fetch more since chunks may belong to same resume
+    tenant_filter = Filter(
+        must=[
+            FieldCondition(
+                key="tenant_id",
+                match=MatchValue(value=str(tenant_id)),
+            )
+        ],
+        # Job description vectors share the collection; they are not candidates
+        must_not=[
+            FieldCondition(
+                key="type",
+                match=MatchValue(value="job"),
+            )
+        ],
     )
+    # Search more chunks to ensure we get enough unique resumes. The filter
+    # itself is exact (indexed); the headroom is for deduplicating chunks.
+    limit = top_k * 5  # fetch more since chunks may belong to same resume
+
+    if settings.hybrid_search and job_sparse is not None:
+        results = await client.query_points(
+            collection_name=COLLECTION_NAME,
+            prefetch=[
+                Prefetch(
+                    query=job_embedding,
+                    using=DENSE_VECTOR_NAME,
+                    filter=tenant_filter,
+                    params=QUANTIZED_SEARCH_PARAMS,
+                    limit=limit,
+                ),
+                Prefetch(
+                    query=job_sparse,
+                    using=SPARSE_VECTOR_NAME,
+                    filter=tenant_filter,
+                    limit=limit,
+                ),
+            ],
+            query=FusionQuery(fusion=Fusion.RRF),
+            query_filter=tenant_filter,
+            limit=limit,
+            with_payload=RESUME_ID_PAYLOAD,
+        )
+    else:
+        results = await client.query_points(
+            collection_name=COLLECTION_NAME,
+            query=job_embedding,
+            using=_dense_using(),
+            query_filter=tenant_filter,
+            limit=limit,
+            search_params=QUANTIZED_SEARCH_PARAMS,
+            with_payload=RESUME_ID_PAYLOAD,
+        )
 
     # Deduplicate by resume_id, keeping order (best match first)
     seen = set()
@@ -142,35 +379,23 @@ async def find_similar_resumes(
     return resume_ids
 
 
-async def find_resume_chunks(
-    resume_id: UUID,
-    job_embedding: list[float],
-    top_k: int = 5,
-) -> list[str]:
-    """Find the most relevant chunks for a specific resume given a job embedding.
-
-    Returns chunk texts sorted by relevance.
-    """
-    client = get_qdrant_client()
-    results = await client.query_points(
-        collection_name=COLLECTION_NAME,
-        query=job_embedding,
-        query_filter=Filter(
-            must=[
-                FieldCondition(
-                    key="resume_id",
-                    match=MatchValue(value=str(resume_id)),
-                ),
-                FieldCondition(
-                    key="type",
-                    match=MatchValue(value="resume_chunk"),
-                ),
-            ]
-        ),
-        limit=top_k,
+def _resume_chunk_filter(resume_id: UUID) -> Filter:
+    return Filter(
+        must=[
+            FieldCondition(
+                key="resume_id",
+                match=MatchValue(value=str(resume_id)),
+            ),
+            FieldCondition(
+                key="type",
+                match=MatchValue(value="resume_chunk"),
+            ),
+        ]
     )
 
-    # Sort by chunk_index to maintain document order
+
+def _chunk_texts_in_order(results: QueryResponse) -> list[str]:
+    """Chunk texts from a search result, sorted by chunk_index to keep document order."""
     chunks = []
     for point in results.points:
         payload = point.payload or {}
@@ -181,3 +406,33 @@ async def find_resume_chunks(
 
     chunks.sort(key=lambda x: x[0])
     return [text for _, text in chunks]
+
+
+async def find_resume_chunks_batch(
+    resume_ids: list[UUID],
+    job_embedding: list[float],
+    top_k: int = 5,
+) -> list[list[str]]:
+    """Find the most relevant chunks for each resume given a job embedding.
+
+    Sent as one batched Qdrant request. Returns one list of chunk texts per
+    resume id, sorted by chunk_index, in input order.
+    """
+    if not resume_ids:
+        return []
+    client = get_qdrant_client()
+    responses = await client.query_batch_points(
+        collection_name=COLLECTION_NAME,
+        requests=[
+            QueryRequest(
+                query=job_embedding,
+                using=_dense_using(),
+                filter=_resume_chunk_filter(resume_id),
+                params=QUANTIZED_SEARCH_PARAMS,
+                limit=top_k,
+                with_payload=CHUNK_TEXT_PAYLOAD,
+            )
+            for resume_id in resume_ids
+        ],
+    )
+    return [_chunk_texts_in_order(results) for results in responses]
@@ -6,8 +6,8 @@ Run via: docker compose exec -T app python scripts/seed_data.py
 import asyncio
 import uuid
 
-from jose import jwt
-from sqlalchemy import select
+import jwt
+from sqlalchemy import insert, select
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 
 from app.core.config import settings
@@ -148,15 +148,20 @@ async def seed() -> None:
             requirements=["Python", "PostgreSQL", "Redis", "Docker", "Kubernetes"],
         ))
 
-        # Insert resumes
-        for r in RESUMES:
-            session.add(Resume(
-                id=r["id"],
-                tenant_id=TENANT_ID,
-                candidate_name=r["name"],
-                email=r["email"],
-                raw_text=r["text"],
-            ))
+        # Insert resumes in one multi-row INSERT
+        await session.execute(
+            insert(Resume),
+            [
+                {
+                    "id": r["id"],
+                    "tenant_id": TENANT_ID,
+                    "candidate_name": r["name"],
+                    "email": r["email"],
+                    "raw_text": r["text"],
+                }
+                for r in RESUMES
+            ],
+        )
 
         await session.commit()
 
@@ -165,7 +170,7 @@ async def seed() -> None:
     # Generate JWT token for testing
     token = jwt.encode(
         {"tenant_id": str(TENANT_ID), "sub": "demo-user", "role": "admin"},
-        settings.jwt_secret,
+        settings.jwt_secret_bytes,
         algorithm=settings.jwt_algorithm,
     )
 
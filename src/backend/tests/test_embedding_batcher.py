@@ -0,0 +1,95 @@
+"""Tests for embedding micro-batching -- concurrent requests must share API calls."""
+
+import asyncio
+
+import pytest
+
+from app.services.embedding_batcher import EmbeddingBatcher
+
+
+class FakeEmbedder:
+    """Records each batch it receives and returns one-element vectors."""
+
+    def __init__(self):
+        self.calls: list[list[str]] = []
+
+    async def __call__(self, texts: list[str]) -> list[list[float]]:
+        self.calls.append(list(texts))
+        return [[float(len(t))] for t in texts]
+
+
+class TestEmbeddingBatcher:
+    def test_concurrent_submits_share_one_call(self):
+        embedder = FakeEmbedder()
+
+        async def run():
+            batcher = EmbeddingBatcher(embedder)
+            return await asyncio.gather(
+                batcher.submit("a"),
+                batcher.submit("bb"),
+                batcher.submit("ccc"),
+            )
+
+        results = asyncio.run(run())
+        assert results == [[1.0], [2.0], [3.0]]
+        assert len(embedder.calls) == 1
+
+    def test_submit_many_preserves_order(self):
+        embedder = FakeEmbedder()
+
+        async def run():
+            batcher = EmbeddingBatcher(embedder, max_batch_size=2)
+            return await batcher.submit_many(["a", "bb", "ccc", "dddd", "eeeee"])
+
+        results = asyncio.run(run())
+        assert results == [[1.0], [2.0], [3.0], [4.0], [5.0]]
+        assert all(len(batch) <= 2 for batch in embedder.calls)
+
+    def test_failure_propagates_to_callers(self):
+        async def failing(texts):
+            raise RuntimeError("API down")
+
+        async def run():
+            batcher = EmbeddingBatcher(failing)
+            await batcher.submit("a")
+
+        with pytest.raises(RuntimeError, match="API down"):
+            asyncio.run(run())
+
+    def test_short_result_fails_every_caller(self):
+        async def short(texts):
+            return [[1.0]]  # one vector, however many texts
+
+        async def run():
+            batcher = EmbeddingBatcher(short)
+            return await asyncio.wait_for(batcher.submit_many(["a", "bb"]), timeout=1)
+
+        with pytest.raises(RuntimeError, match="1 vectors for 2 texts"):
+            asyncio.run(run())
+
+    def test_close_during_wait_window_fails_caller(self):
+        embedder = FakeEmbedder()
+
+        async def run():
+            batcher = EmbeddingBatcher(embedder, max_wait=0.5)
+            pending = asyncio.create_task(batcher.submit("a"))
+            await asyncio.sleep(0.05)  # worker holds "a" while it waits for more texts
+            await batcher.close()
+            return await asyncio.wait_for(pending, timeout=1)
+
+        with pytest.raises(RuntimeError, match="closed"):
+            asyncio.run(run())
+        assert embedder.calls == []
+
+    def test_close_stops_worker(self):
+        embedder = FakeEmbedder()
+
+        async def run():
+            batcher = EmbeddingBatcher(embedder)
+            await batcher.submit("a")
+            worker = batcher._worker
+            await batcher.close()
+            return worker
+
+        worker = asyncio.run(run())
+        assert worker.cancelled()
@@ -3,6 +3,7 @@
 from app.prompts.resume_screening import (
     PROMPT_VERSION,
     SYSTEM_PROMPT,
+    USER_PROMPT_TEMPLATE,
     build_screening_prompt,
 )
 
@@ -46,3 +47,15 @@ def test_build_screening_prompt_preserves_json_template():
     assert '"strengths"' in user
     assert '"weaknesses"' in user
     assert '"reasoning"' in user
+
+
+def test_build_screening_prompt_matches_template_format():
+    """The pre-split template must render exactly like USER_PROMPT_TEMPLATE.format()."""
+    values = {
+        "job_title": "Data Engineer",
+        "job_description": "Spark, Airflow, {braces} in text",
+        "resume_text": "John Roe\nBuilt pipelines",
+    }
+    _, user = build_screening_prompt(**values)
+    assert user == USER_PROMPT_TEMPLATE.format(**values)
+    assert "{{" not in user
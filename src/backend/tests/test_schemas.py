@@ -11,6 +11,7 @@ from app.models.schemas import (
     ResumeCreate,
     ScreeningScore,
     StrengthWeakness,
+    parse_llm_score,
 )
 
 
@@ -82,11 +83,42 @@ class TestScreeningScore:
             "reasoning": "Academic background is strong but limited industry experience.",
             "experience_match": "partial",
             "skills_match": "strong",
-        })
-        score = ScreeningScore.model_validate_json(llm_output)
+        }).encode()
+        score = parse_llm_score(llm_output)
         assert score.score == 65
         assert score.strengths[0].point == "Relevant degree"
 
+    def test_from_trusted_skips_validation(self):
+        """from_trusted is for our own cached data: it deliberately bypasses range checks."""
+        data = {
+            "score": 150,
+            "strengths": [{"point": "Strong Python", "evidence": "5 years FastAPI experience"}],
+            "weaknesses": [],
+            "reasoning": "test",
+            "experience_match": "strong",
+            "skills_match": "partial",
+        }
+        score = ScreeningScore.from_trusted(data)
+        assert score.score == 150
+        assert isinstance(score.strengths[0], StrengthWeakness)
+        assert score.skills_match == MatchLevel.partial
+
+    def test_cache_payload_round_trip(self):
+        from app.services.cache_service import _decode_score, _encode_score
+
+        score = ScreeningScore.model_validate({
+            "score": 78,
+            "strengths": [{"point": "Strong Python", "evidence": "5 years FastAPI experience"}],
+            "weaknesses": [{"point": "No K8s", "evidence": "Only mentions Docker"}],
+            "reasoning": "Solid backend engineer with gaps in cloud-native.",
+            "experience_match": "strong",
+            "skills_match": "partial",
+        })
+        first = _encode_score(score)
+        second = _encode_score(score)  # the shared packer must reset between calls
+        assert first == second
+        assert _decode_score(first) == score
+
 
 class TestJobCreate:
     def test_valid_job(self):
@@ -0,0 +1,235 @@
+"""Tests for vector_service over Qdrant's gRPC transport.
+
+The client talks to an in-process gRPC server that implements Qdrant's
+Collections and Points services on top of an in-memory Qdrant, so every
+request goes through the real qdrant-client gRPC conversions.
+"""
+
+import asyncio
+import math
+import random
+from uuid import uuid4
+
+import grpc.aio
+import pytest
+from qdrant_client import AsyncQdrantClient, grpc as qgrpc
+from qdrant_client.conversions.conversion import GrpcToRest, RestToGrpc
+from qdrant_client.models import Distance, Filter, ScalarType, SparseVector, VectorParams
+
+from app.core.config import settings
+from app.services import embedding_service, vector_service
+
+
+class CollectionsService(qgrpc.CollectionsServicer):
+    def __init__(self, backend: AsyncQdrantClient, calls: list[str]):
+        self.backend = backend
+        self.calls = calls
+        # Local mode does not keep quantization config, so the server does
+        self.quantization: dict[str, object] = {}
+
+    async def List(self, request, context):
+        response = await self.backend.get_collections()
+        return qgrpc.ListCollectionsResponse(
+            collections=[qgrpc.CollectionDescription(name=c.name) for c in response.collections]
+        )
+
+    async def Get(self, request, context):
+        info = await self.backend.get_collection(request.collection_name)
+        info.config.quantization_config = self.quantization.get(request.collection_name)
+        return qgrpc.GetCollectionInfoResponse(result=RestToGrpc.convert_collection_info(info))
+
+    async def Create(self, request, context):
+        self.calls.append("create_collection")
+        if request.HasField("quantization_config"):
+            self.quantization[request.collection_name] = GrpcToRest.convert_quantization_config(
+                request.quantization_config
+            )
+        await self.backend.create_collection(
+            collection_name=request.collection_name,
+            vectors_config=GrpcToRest.convert_vectors_config(request.vectors_config),
+            sparse_vectors_config=(
+                GrpcToRest.convert_sparse_vector_config(request.sparse_vectors_config)
+                if request.HasField("sparse_vectors_config") else None
+            ),
+        )
+        return qgrpc.CollectionOperationResponse(result=True)
+
+    async def Update(self, request, context):
+        update = GrpcToRest.convert_update_collection(request)
+        self.calls.append(f"update_collection:{type(update.quantization_config).__name__}")
+        self.quantization[request.collection_name] = update.quantization_config
+        return qgrpc.CollectionOperationResponse(result=True)
+
+
+def _server_filter(f: Filter | None) -> Filter | None:
+    """GrpcToRest yields empty clause lists, which local mode reads as "match nothing"."""
+    if f is None:
+        return None
+    return Filter(must=f.must or None, should=f.should or None, must_not=f.must_not or None)
+
+
+class PointsService(qgrpc.PointsServicer):
+    def __init__(self, backend: AsyncQdrantClient, calls: list[str]):
+        self.backend = backend
+        self.calls = calls
+
+    @staticmethod
+    def _ok() -> qgrpc.PointsOperationResponse:
+        return qgrpc.PointsOperationResponse(
+            result=qgrpc.UpdateResult(operation_id=0, status=qgrpc.UpdateStatus.Completed)
+        )
+
+    async def CreateFieldIndex(self, request, context):
+        self.calls.append(f"index:{request.field_name}:{qgrpc.FieldType.Name(request.field_type)}")
+        return self._ok()
+
+    async def Upsert(self, request, context):
+        await self.backend.upsert(
+            collection_name=request.collection_name,
+            points=[GrpcToRest.convert_point_struct(point) for point in request.points],
+        )
+        return self._ok()
+
+    async def _query(self, request: qgrpc.QueryPoints):
+        query = GrpcToRest.convert_query_points(request)
+        prefetch = [
+            p.model_copy(update={"filter": _server_filter(p.filter)}) for p in query.prefetch or []
+        ]
+        response = await self.backend.query_points(
+            collection_name=request.collection_name,
+            query=query.query,
+            using=query.using,
+            prefetch=prefetch or None,
+            query_filter=_server_filter(query.filter),
+            search_params=query.params,
+            limit=query.limit,
+            with_payload=query.with_payload,
+            with_vectors=query.with_vector,
+        )
+        return [RestToGrpc.convert_scored_point(point) for point in response.points]
+
+    async def Query(self, request, context):
+        self.calls.append("prefetch_query" if request.prefetch else "query")
+        return qgrpc.QueryResponse(result=await self._query(request))
+
+    async def QueryBatch(self, request, context):
+        self.calls.append("query_batch")
+        return qgrpc.QueryBatchResponse(
+            result=[qgrpc.BatchResult(result=await self._query(q)) for q in request.query_points]
+        )
+
+    async def Get(self, request, context):
+        self.calls.append("retrieve")
+        records = await self.backend.retrieve(
+            collection_name=request.collection_name,
+            ids=[GrpcToRest.convert_point_id(point_id) for point_id in request.ids],
+            with_payload=GrpcToRest.convert_with_payload_selector(request.with_payload),
+            with_vectors=GrpcToRest.convert_with_vectors_selector(request.with_vectors),
+        )
+        # A real server sends an empty payload for with_payload=False
+        records = [r.model_copy(update={"payload": r.payload or {}}) for r in records]
+        return qgrpc.GetResponse(result=[RestToGrpc.convert_retrieved_point(r) for r in records])
+
+
+@pytest.fixture
+def qdrant_grpc(monkeypatch):
+    """Point vector_service at an in-process gRPC server; yields (run, calls)."""
+    calls: list[str] = []
+
+    def run(scenario):
+        async def main():
+            backend = AsyncQdrantClient(location=":memory:")
+            server = grpc.aio.server()
+            qgrpc.add_CollectionsServicer_to_server(CollectionsService(backend, calls), server)
+            qgrpc.add_PointsServicer_to_server(PointsService(backend, calls), server)
+            port = server.add_insecure_port("127.0.0.1:0")
+            await server.start()
+
+            monkeypatch.setattr(settings, "qdrant_url", "http://127.0.0.1:6333")
+            monkeypatch.setattr(settings, "qdrant_grpc_port", port)
+            monkeypatch.setattr(vector_service, "_qdrant_client", None)
+            monkeypatch.setattr(vector_service, "_collection_ready", False)
+            try:
+                return await scenario(backend)
+            finally:
+                await vector_service.get_qdrant_client().close()
+                await server.stop(None)
+
+        return asyncio.run(main())
+
+    return run, calls
+
+
+def _vector() -> list[float]:
+    """A random unit vector (cosine collections store vectors normalised)."""
+    values = [random.random() for _ in range(vector_service.VECTOR_DIM)]
+    norm = math.sqrt(sum(v * v for v in values))
+    return [v / norm for v in values]
+
+
+class TestGrpcTransport:
+    def test_grpc_is_the_default_transport(self):
+        assert settings.qdrant_prefer_grpc
+
+    def test_hybrid_ingest_and_search(self, qdrant_grpc, monkeypatch):
+        run, calls = qdrant_grpc
+        monkeypatch.setattr(settings, "hybrid_search", True)
+        tenant_id, resume_id, job_id = uuid4(), uuid4(), uuid4()
+        job_vector = _vector()
+        sparse = SparseVector(indices=[1, 7], values=[0.5, 1.5])
+
+        async def scenario(backend):
+            await vector_service.ensure_collection()
+            await vector_service.upsert_resume_chunks(
+                resume_id, tenant_id, ["Python", "FastAPI", "Kubernetes"],
+                [_vector() for _ in range(3)], [sparse] * 3,
+            )
+            await vector_service.upsert_job_embedding(job_id, tenant_id, job_vector, sparse)
+
+            similar = await vector_service.find_similar_resumes(tenant_id, job_vector, job_sparse=sparse)
+            chunks = await vector_service.find_resume_chunks_batch([resume_id, uuid4()], job_vector, top_k=2)
+            stored = await embedding_service.get_embedding_vector(str(job_id))
+            return similar, chunks, stored
+
+        similar, chunks, stored = run(scenario)
+        assert similar == [str(resume_id)]
+        assert len(chunks[0]) == 2 and chunks[1] == []
+        assert stored == pytest.approx(job_vector, abs=1e-6)
+        assert calls == [
+            "create_collection",
+            "index:tenant_id:FieldTypeKeyword",
+            "index:resume_id:FieldTypeKeyword",
+            "index:type:FieldTypeKeyword",
+            "prefetch_query",
+            "query_batch",
+            "retrieve",
+        ]
+
+    def test_quantization_backfilled_on_existing_collection(self, qdrant_grpc):
+        run, calls = qdrant_grpc
+
+        async def scenario(backend):
+            await backend.create_collection(
+                vector_service.COLLECTION_NAME,
+                vectors_config=VectorParams(size=vector_service.VECTOR_DIM, distance=Distance.COSINE),
+            )
+            await vector_service.ensure_collection()
+            client = vector_service.get_qdrant_client()
+            return await client.get_collection(vector_service.COLLECTION_NAME)
+
+        info = run(scenario)
+        assert calls[0] == "update_collection:ScalarQuantization"
+        assert "create_collection" not in calls
+        assert info.config.quantization_config.scalar.type == ScalarType.INT8
+
+
+class TestFastembedDim:
+    def test_dimension_follows_configured_model(self):
+        pytest.importorskip("fastembed")
+        assert vector_service.fastembed_dim("BAAI/bge-small-en-v1.5") == 384
+        assert vector_service.fastembed_dim("BAAI/bge-base-en-v1.5") == 768
+
+    def test_unknown_model_rejected(self):
+        pytest.importorskip("fastembed")
+        with pytest.raises(ValueError, match="Unsupported FastEmbed model"):
+            vector_service.fastembed_dim("not/a-model")